@@ -1,14 +1,35 @@
-from action.edit_action import EditAction
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+from action.edit_action import EditAction, actionFromRecord
+
+if TYPE_CHECKING:
+    from text.text_editor_model import TextEditorModel
 
 
 class CompoundAction(EditAction):
+    __slots__ = ("actions",)
+
     def __init__(self, actions: list[EditAction]) -> None:
         self.actions: list[EditAction] = actions
 
-    def executeDo(self) -> None:
+    def executeDo(self, tem: TextEditorModel) -> None:
         for action in self.actions:
-            action.executeDo()
+            action.executeDo(tem)
 
-    def executeUndo(self) -> None:
+    def executeUndo(self, tem: TextEditorModel) -> None:
         for action in reversed(self.actions):
-            action.executeUndo()
+            action.executeUndo(tem)
+
+    def size(self) -> int:
+        return sum(action.size() for action in self.actions)
+
+    def toRecord(self) -> list[Any] | None:
+        records = [action.toRecord() for action in self.actions]
+        if None in records:
+            return None
+
+        return ["compound", *records]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> CompoundAction:
+        return cls([actionFromRecord(child) for child in record[1:]])
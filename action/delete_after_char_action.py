@@ -1,6 +1,6 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from action.edit_action import EditAction
+from typing import TYPE_CHECKING, Any
+from action.edit_action import ACTION_OVERHEAD, EditAction, isWordBreak
 from location.location import Location
 
 if TYPE_CHECKING:
@@ -8,14 +8,46 @@ if TYPE_CHECKING:
 
 
 class DeleteAfterCharAction(EditAction):
-    def __init__(self, tem: TextEditorModel, text: str, location: Location) -> None:
-        self.tem: TextEditorModel = tem
+    __slots__ = ("text", "location")
+
+    def __init__(self, text: str, location: Location) -> None:
         self.text: str = text
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem.deleteAfter(Location(self.location.row, self.location.col))
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem._undo_insert_char(self.text, self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._insert_char(self.text, self.location)
+        tem.setCursorLocation(self.location)
+
+    def merge(self, action: EditAction, breakOnWords: bool) -> bool:
+        if not isinstance(action, DeleteAfterCharAction):
+            return False
+
+        if action.location.getCoords() != self.location.getCoords():
+            return False
+
+        if breakOnWords and isWordBreak(self.text, action.text):
+            return False
+
+        self.text += action.text
+        return True
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD + len(self.text)
+
+    def toRecord(self) -> list[Any]:
+        return ["delete_after_char", self.text, *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> DeleteAfterCharAction:
+        text, row, col = record[1:]
+        return cls(text, Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, self.text)
 
-    def executeUndo(self) -> None:
-        self.tem._insert_char(self.text, self.location)
-        self.tem.moveCursorLeft(None)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> DeleteAfterCharAction:
+        return cls(payload, Location(row, col))
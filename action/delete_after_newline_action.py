@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from action.edit_action import EditAction
 from location.location import Location
 
@@ -8,13 +8,29 @@ if TYPE_CHECKING:
 
 
 class DeleteAfterNewlineAction(EditAction):
-    def __init__(self, tem: TextEditorModel, location: Location) -> None:
-        self.tem: TextEditorModel = tem
+    __slots__ = ("location",)
+
+    def __init__(self, location: Location) -> None:
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem.deleteAfter(Location(self.location.row, self.location.col))
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem.deleteAfter(self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._insert_newline(self.location)
+        tem.moveCursorLeft(None)
+
+    def toRecord(self) -> list[Any]:
+        return ["delete_after_newline", *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> DeleteAfterNewlineAction:
+        row, col = record[1:]
+        return cls(Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, None)
 
-    def executeUndo(self) -> None:
-        self.tem._insert_newline(self.location)
-        self.tem.moveCursorLeft(None)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> DeleteAfterNewlineAction:
+        return cls(Location(row, col))
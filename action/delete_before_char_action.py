@@ -1,6 +1,6 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from action.edit_action import EditAction
+from typing import TYPE_CHECKING, Any
+from action.edit_action import ACTION_OVERHEAD, EditAction, isWordBreak
 from location.location import Location
 
 if TYPE_CHECKING:
@@ -8,13 +8,47 @@ if TYPE_CHECKING:
 
 
 class DeleteBeforeCharAction(EditAction):
-    def __init__(self, tem: TextEditorModel, text: str, location: Location) -> None:
-        self.tem: TextEditorModel = tem
+    __slots__ = ("text", "location")
+
+    def __init__(self, text: str, location: Location) -> None:
         self.text: str = text
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem.deleteBefore(Location(self.location.row, self.location.col))
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem._undo_insert_char(self.text, self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._insert_char(self.text, self.location)
+
+    def merge(self, action: EditAction, breakOnWords: bool) -> bool:
+        if not isinstance(action, DeleteBeforeCharAction):
+            return False
+
+        row, col = action.location.getCoords()
+        if self.location.getCoords() != (row, col + len(action.text)):
+            return False
+
+        if breakOnWords and isWordBreak(action.text, self.text):
+            return False
+
+        self.text = action.text + self.text
+        self.location = action.location
+        return True
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD + len(self.text)
+
+    def toRecord(self) -> list[Any]:
+        return ["delete_before_char", self.text, *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> DeleteBeforeCharAction:
+        text, row, col = record[1:]
+        return cls(text, Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, self.text)
 
-    def executeUndo(self) -> None:
-        self.tem._insert_char(self.text, self.location)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> DeleteBeforeCharAction:
+        return cls(payload, Location(row, col))
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from action.edit_action import EditAction
 from location.location import Location
 
@@ -8,12 +8,28 @@ if TYPE_CHECKING:
 
 
 class DeleteBeforeNewlineAction(EditAction):
-    def __init__(self, tem: TextEditorModel, location: Location) -> None:
-        self.tem: TextEditorModel = tem
+    __slots__ = ("location",)
+
+    def __init__(self, location: Location) -> None:
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem.deleteBefore(Location(self.location.row, self.location.col))
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem.deleteBefore(self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._insert_newline(self.location)
+
+    def toRecord(self) -> list[Any]:
+        return ["delete_before_newline", *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> DeleteBeforeNewlineAction:
+        row, col = record[1:]
+        return cls(Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, None)
 
-    def executeUndo(self) -> None:
-        self.tem._insert_newline(self.location)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> DeleteBeforeNewlineAction:
+        return cls(Location(row, col))
@@ -1,28 +1,51 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from action.edit_action import EditAction
+from typing import TYPE_CHECKING, Any
+from action.edit_action import ACTION_OVERHEAD, EditAction, packText, unpackText
+from location.location import Location
+from location.location_range import LocationRange
 
 if TYPE_CHECKING:
-    from location.location import Location
-    from location.location_range import LocationRange
     from text.text_editor_model import TextEditorModel
 
 
 class DeleteRangeAction(EditAction):
+    __slots__ = ("payload", "locationRange", "cursorLoaciton")
+
     def __init__(
         self,
-        tem: TextEditorModel,
         text: str,
         locationRange: LocationRange,
         cursorLoaciton: Location,
     ) -> None:
-        self.tem: TextEditorModel = tem
-        self.text: str = text
+        self.payload: str | bytes = packText(text)
         self.locationRange: LocationRange = locationRange
         self.cursorLoaciton: Location = cursorLoaciton
 
-    def executeDo(self) -> None:
-        self.tem.deleteRange(self.locationRange)
+    @property
+    def text(self) -> str:
+        return unpackText(self.payload)
+
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem.deleteRange(self.locationRange)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._undo_delete_range(self.text, self.locationRange, self.cursorLoaciton)
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD + len(self.payload)
+
+    def toRecord(self) -> list[Any]:
+        start, end = self.locationRange.start, self.locationRange.end
+        return [
+            "delete_range",
+            self.text,
+            *start.getCoords(),
+            *end.getCoords(),
+            *self.cursorLoaciton.getCoords(),
+        ]
 
-    def executeUndo(self) -> None:
-        self.tem._undo_delete_range(self.text, self.locationRange, self.cursorLoaciton)
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> DeleteRangeAction:
+        text, s_row, s_col, e_row, e_col, row, col = record[1:]
+        locationRange = LocationRange(Location(s_row, s_col), Location(e_row, e_col))
+        return cls(text, locationRange, Location(row, col))
@@ -1,11 +1,64 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
 from abc import ABC, abstractmethod
+from importlib import import_module
+import zlib
+
+if TYPE_CHECKING:
+    from text.text_editor_model import TextEditorModel
+
+ACTION_OVERHEAD = 24
+COMPRESS_THRESHOLD = 4096
 
 
 class EditAction(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def executeDo(self) -> None:
+    def executeDo(self, tem: TextEditorModel) -> None:
         pass
 
     @abstractmethod
-    def executeUndo(self) -> None:
+    def executeUndo(self, tem: TextEditorModel) -> None:
         pass
+
+    def merge(self, action: EditAction, breakOnWords: bool) -> bool:
+        return False
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD
+
+    def toRecord(self) -> list[Any] | None:
+        return None
+
+    def pack(self) -> tuple[int, int, Any] | None:
+        return None
+
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> EditAction:
+        raise NotImplementedError(f"{cls.__name__} cannot be unpacked")
+
+
+def isWordBreak(left: str, right: str) -> bool:
+    return left[-1:].isspace() and not right[:1].isspace()
+
+
+def packText(text: str) -> str | bytes:
+    if len(text) < COMPRESS_THRESHOLD:
+        return text
+
+    return zlib.compress(text.encode("utf-8"), 1)
+
+
+def unpackText(payload: str | bytes) -> str:
+    if isinstance(payload, str):
+        return payload
+
+    return zlib.decompress(payload).decode("utf-8")
+
+
+def actionFromRecord(record: list[Any]) -> EditAction:
+    kind = record[0]
+    className = "".join([part.capitalize() for part in kind.split("_")])
+    actionClass = getattr(import_module(f"action.{kind}_action"), f"{className}Action")
+    return actionClass.fromRecord(record)
@@ -1,20 +1,53 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from action.edit_action import EditAction
+from typing import TYPE_CHECKING, Any
+from action.edit_action import ACTION_OVERHEAD, EditAction, isWordBreak
+from location.location import Location
 
 if TYPE_CHECKING:
-    from location.location import Location
     from text.text_editor_model import TextEditorModel
 
 
 class InsertCharAction(EditAction):
-    def __init__(self, tem: TextEditorModel, text: str, location: Location) -> None:
-        self.tem: TextEditorModel = tem
+    __slots__ = ("text", "location")
+
+    def __init__(self, text: str, location: Location) -> None:
         self.text: str = text
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem._insert_char(self.text, self.location)
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem._insert_char(self.text, self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._undo_insert_char(self.text, self.location)
+
+    def merge(self, action: EditAction, breakOnWords: bool) -> bool:
+        if not isinstance(action, InsertCharAction):
+            return False
+
+        row, col = self.location.getCoords()
+        if action.location.getCoords() != (row, col + len(self.text)):
+            return False
+
+        if breakOnWords and isWordBreak(self.text, action.text):
+            return False
+
+        self.text += action.text
+        return True
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD + len(self.text)
+
+    def toRecord(self) -> list[Any]:
+        return ["insert_char", self.text, *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> InsertCharAction:
+        text, row, col = record[1:]
+        return cls(text, Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, self.text)
 
-    def executeUndo(self) -> None:
-        self.tem._undo_insert_char(self.text, self.location)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> InsertCharAction:
+        return cls(payload, Location(row, col))
@@ -1,20 +1,46 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from action.edit_action import EditAction
+from typing import TYPE_CHECKING, Any
+from action.edit_action import ACTION_OVERHEAD, EditAction, packText, unpackText
+from location.location import Location
 
 if TYPE_CHECKING:
-    from location.location import Location
     from text.text_editor_model import TextEditorModel
 
 
 class InsertMultilineAction(EditAction):
-    def __init__(self, tem: TextEditorModel, text: str, location: Location) -> None:
-        self.tem: TextEditorModel = tem
-        self.text: str = text
+    __slots__ = ("payload", "location")
+
+    def __init__(self, text: str, location: Location) -> None:
+        self.payload: str | bytes = packText(text)
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem._insert_multiline(self.text, self.location)
+    @property
+    def text(self) -> str:
+        return unpackText(self.payload)
+
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem._insert_multiline(self.text, self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._undo_insert_multiline(self.text, self.location)
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD + len(self.payload)
+
+    def toRecord(self) -> list[Any]:
+        return ["insert_multiline", self.text, *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> InsertMultilineAction:
+        text, row, col = record[1:]
+        return cls(text, Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, self.payload)
 
-    def executeUndo(self) -> None:
-        self.tem._undo_insert_multiline(self.text, self.location)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> InsertMultilineAction:
+        action = cls.__new__(cls)
+        action.payload = payload
+        action.location = Location(row, col)
+        return action
@@ -1,19 +1,35 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from action.edit_action import EditAction
+from location.location import Location
 
 if TYPE_CHECKING:
-    from location.location import Location
     from text.text_editor_model import TextEditorModel
 
 
 class InsertNewlineAction(EditAction):
-    def __init__(self, tem: TextEditorModel, location: Location) -> None:
-        self.tem: TextEditorModel = tem
+    __slots__ = ("location",)
+
+    def __init__(self, location: Location) -> None:
         self.location: Location = location
 
-    def executeDo(self) -> None:
-        self.tem._insert_newline(self.location)
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem._insert_newline(self.location)
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._undo_insert_newline(self.location)
+
+    def toRecord(self) -> list[Any]:
+        return ["insert_newline", *self.location.getCoords()]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> InsertNewlineAction:
+        row, col = record[1:]
+        return cls(Location(row, col))
+
+    def pack(self) -> tuple[int, int, Any]:
+        return (*self.location, None)
 
-    def executeUndo(self) -> None:
-        self.tem._undo_insert_newline(self.location)
+    @classmethod
+    def unpack(cls, row: int, col: int, payload: Any) -> InsertNewlineAction:
+        return cls(Location(row, col))
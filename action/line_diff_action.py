@@ -0,0 +1,73 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+from array import array
+from itertools import accumulate
+from action.edit_action import ACTION_OVERHEAD, EditAction, packText, unpackText
+
+if TYPE_CHECKING:
+    from document.document import LineDiff
+    from text.text_editor_model import TextEditorModel
+
+
+class LineDiffAction(EditAction):
+    __slots__ = (
+        "rows",
+        "cols",
+        "removedLengths",
+        "insertedLengths",
+        "removedPayload",
+        "insertedPayload",
+    )
+
+    def __init__(self, diffs: list[LineDiff]) -> None:
+        rows, cols, removed, inserted = zip(*diffs)
+
+        self.rows: array[int] = array("I", rows)
+        self.cols: array[int] = array("I", cols)
+        self.removedLengths: array[int] = array("I", map(len, removed))
+        self.insertedLengths: array[int] = array("I", map(len, inserted))
+        self.removedPayload: str | bytes = packText("".join(removed))
+        self.insertedPayload: str | bytes = packText("".join(inserted))
+
+    def diffs(self) -> list[LineDiff]:
+        return list(
+            zip(
+                self.rows,
+                self.cols,
+                _split(unpackText(self.removedPayload), self.removedLengths),
+                _split(unpackText(self.insertedPayload), self.insertedLengths),
+            )
+        )
+
+    def executeDo(self, tem: TextEditorModel) -> None:
+        tem._replace_lines(self.diffs())
+
+    def executeUndo(self, tem: TextEditorModel) -> None:
+        tem._undo_replace_lines(self.diffs())
+
+    def size(self) -> int:
+        return (
+            ACTION_OVERHEAD
+            + 16 * len(self.rows)
+            + len(self.removedPayload)
+            + len(self.insertedPayload)
+        )
+
+    def toRecord(self) -> list[Any]:
+        return [
+            "line_diff",
+            self.rows.tolist(),
+            self.cols.tolist(),
+            _split(unpackText(self.removedPayload), self.removedLengths),
+            _split(unpackText(self.insertedPayload), self.insertedLengths),
+        ]
+
+    @classmethod
+    def fromRecord(cls, record: list[Any]) -> LineDiffAction:
+        rows, cols, removed, inserted = record[1:]
+        return cls(list(zip(rows, cols, removed, inserted)))
+
+
+def _split(text: str, lengths: array[int]) -> list[str]:
+    ends = list(accumulate(lengths))
+    return [text[end - length : end] for end, length in zip(ends, lengths)]
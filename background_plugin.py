@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from abc import abstractmethod
+from plugin import Plugin
+
+if TYPE_CHECKING:
+    from document.document import Document, LineDiff
+    from task.background_task import BackgroundTask
+    from text.text_editor_model import TextEditorModel
+    from undo.undo_manager import UndoManager
+    from clipboard.clipboard_stack import ClipboardStack
+
+PROGRESS_LINES: int = 4096
+
+
+class BackgroundPlugin(Plugin):
+    @abstractmethod
+    def transformLine(self, line: str) -> str:
+        pass
+
+    def execute(
+        self,
+        model: TextEditorModel,
+        undoManager: UndoManager,
+        clipboardStack: ClipboardStack,
+    ) -> None:
+        action = model.transformLines(self.transformLine)
+
+        if action:
+            undoManager.push(action)
+
+    def compute(self, snapshot: Document, task: BackgroundTask) -> list[LineDiff]:
+        total = snapshot.lineCount()
+        diffs = []
+
+        for row, line in enumerate(snapshot.allLines()):
+            if not row % PROGRESS_LINES:
+                if task.isCancelled():
+                    raise InterruptedError(f"{self.getName()} cancelled")
+                task.post(row / total)
+
+            transformed = self.transformLine(line)
+            if transformed != line:
+                diffs.append((row, 0, line, transformed))
+
+        return diffs
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from benchmarks.document_benchmark import DOCUMENTS, makeText
+from location.location import Location
+from text.text_editor_model import TextEditorModel
+from undo.undo_manager import UndoManager
+
+
+class KeyEvent:
+    def __init__(self, char: str) -> None:
+        self.char: str = char
+
+
+KEY: KeyEvent = KeyEvent("")
+
+KEYSTROKES: dict[str, Callable[[TextEditorModel, UndoManager], None]] = {
+    "type": lambda model, um: um.push(model.keyPress(KeyEvent("a"))),
+    "enter": lambda model, um: um.push(model.keyPress(KeyEvent("\r"))),
+    "backspace": lambda model, um: um.push(model.deleteBefore()),
+    "delete": lambda model, um: um.push(model.deleteAfter()),
+    "moveLeft": lambda model, um: model.moveCursorLeft(KEY),
+    "moveRight": lambda model, um: model.moveCursorRight(KEY),
+    "moveDown": lambda model, um: model.moveCursorDown(KEY),
+    "selectRight": lambda model, um: model.selectRight(),
+    "selectDown": lambda model, um: model.selectDown(),
+}
+
+
+def measure(text: str, document: str, keystroke: str, count: int) -> dict[str, float]:
+    um = UndoManager.getInstance()
+    model = TextEditorModel(text, document)
+    um.clear()
+    um.setModel(model)
+    model.setCursorLocation(Location(model.lineCount() // 2, 8))
+
+    press = KEYSTROKES[keystroke]
+    press(model, um)
+
+    transient = 0
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(count):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        press(model, um)
+        transient += tracemalloc.get_traced_memory()[1] - before
+
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    um.clear()
+
+    return {"peakBytes": transient / count, "retainedBytes": retained / count}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure memory allocated per keystroke."
+    )
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--documents", nargs="+", default=DOCUMENTS)
+    parser.add_argument("--keystrokes", nargs="+", default=list(KEYSTROKES))
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    text = makeText(args.lines, args.width)
+    results = []
+
+    for document in args.documents:
+        for keystroke in args.keystrokes:
+            result = measure(text, document, keystroke, args.count)
+            results.append({"keystroke": keystroke, "document": document, **result})
+            print(
+                f"{keystroke:14}{document:>12}{result['peakBytes']:>10.0f}B"
+                f"{result['retainedBytes']:>10.0f}B",
+                file=sys.stderr,
+            )
+
+    json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
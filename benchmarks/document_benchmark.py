@@ -0,0 +1,81 @@
+from __future__ import annotations
+import argparse
+import random
+from time import perf_counter
+from document.document import Document, documentFactory
+
+DOCUMENTS: list[str] = ["list", "piece_table", "rope", "mapped"]
+
+
+def makeText(lines: int, width: int) -> str:
+    line = ("lorem ipsum dolor sit amet " * (width // 27 + 1))[:width]
+    return "\n".join(f"{i:08d} {line}" for i in range(lines))
+
+
+def typing(document: Document, rnd: random.Random) -> None:
+    row = rnd.randrange(document.lineCount())
+    col = document.lineLength(row) // 2
+
+    for i in range(1000):
+        document.insert(row, col + i, "x")
+
+
+def paste(document: Document, rnd: random.Random) -> None:
+    text = "\n".join(["pasted line"] * 1000)
+
+    for _ in range(10):
+        document.insert(rnd.randrange(document.lineCount()), 0, text)
+
+
+def copy(document: Document, rnd: random.Random) -> None:
+    for _ in range(100):
+        row = rnd.randrange(max(document.lineCount() - 1000, 1))
+        document.getText(row, 0, min(row + 1000, document.lineCount() - 1), 0)
+
+
+def deleteRange(document: Document, rnd: random.Random) -> None:
+    for _ in range(100):
+        row = rnd.randrange(max(document.lineCount() - 100, 1))
+        document.delete(row, 0, min(row + 100, document.lineCount() - 1), 0)
+
+
+def lineLookup(document: Document, rnd: random.Random) -> None:
+    for _ in range(1000):
+        document.getLine(rnd.randrange(document.lineCount()))
+
+
+BENCHMARKS = {
+    "typing": typing,
+    "paste": paste,
+    "copy": copy,
+    "deleteRange": deleteRange,
+    "lineLookup": lineLookup,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare document backends.")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--documents", nargs="+", default=DOCUMENTS)
+    args = parser.parse_args()
+
+    for lines in args.lines:
+        text = makeText(lines, args.width)
+        print(f"\n{lines} lines x {args.width} chars")
+        print(f"{'':12}" + "".join(f"{name:>14}" for name in args.documents))
+
+        for benchmark, function in BENCHMARKS.items():
+            row = f"{benchmark:12}"
+
+            for name in args.documents:
+                document = documentFactory(name)(text)
+                start = perf_counter()
+                function(document, random.Random(0))
+                row += f"{(perf_counter() - start) * 1000:>12.2f}ms"
+
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
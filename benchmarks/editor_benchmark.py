@@ -0,0 +1,277 @@
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from collections.abc import Callable
+from time import perf_counter
+from benchmarks.document_benchmark import DOCUMENTS, makeText
+from clipboard.clipboard_stack import ClipboardStack
+from location.location import Location
+from location.location_range import LocationRange
+from text.text_editor_model import TextEditorModel
+from undo.undo_manager import UndoManager
+
+
+def _moveTo(model: TextEditorModel, row: int, col: int) -> None:
+    model.setCursorLocation(Location(row, min(col, model.lineLength(row))))
+
+
+def _randomRow(model: TextEditorModel, rnd: random.Random, margin: int = 0) -> int:
+    return rnd.randrange(max(model.lineCount() - margin, 1))
+
+
+def insert(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    row = _randomRow(model, rnd)
+    _moveTo(model, row, model.lineLength(row) // 2)
+
+    for i in range(1000):
+        um.push(model.insert("lorem ipsum "[i % 12]))
+
+
+def deleteBefore(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    for _ in range(10):
+        row = _randomRow(model, rnd)
+        _moveTo(model, row, model.lineLength(row))
+
+        for _ in range(100):
+            um.push(model.deleteBefore())
+
+
+def deleteAfter(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    for _ in range(10):
+        _moveTo(model, _randomRow(model, rnd), 0)
+
+        for _ in range(100):
+            um.push(model.deleteAfter())
+
+
+def deleteRange(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    for _ in range(100):
+        row = _randomRow(model, rnd, 100)
+        end = min(row + 100, model.lineCount() - 1)
+        um.push(model.deleteRange(LocationRange(Location(row, 1), Location(end, 0))))
+
+
+def insertMultiline(
+    model: TextEditorModel, um: UndoManager, rnd: random.Random
+) -> None:
+    text = "\n".join(["inserted line"] * 1000)
+
+    for _ in range(10):
+        _moveTo(model, _randomRow(model, rnd), 0)
+        um.push(model.insert(text))
+
+
+def copyCutPaste(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    clipboardStack = ClipboardStack()
+
+    for _ in range(10):
+        row = _randomRow(model, rnd, 1000)
+        end = min(row + 1000, model.lineCount() - 1)
+        model.setSelectionRange(LocationRange(Location(row, 0), Location(end, 0)))
+        model.copy(None, clipboardStack)
+        um.push(model.cut(None, clipboardStack))
+        um.push(model.paste(clipboardStack))
+
+
+def select(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    _moveTo(model, _randomRow(model, rnd, 500), 0)
+
+    for _ in range(500):
+        model.selectDown()
+    for _ in range(500):
+        model.selectRight()
+    for _ in range(500):
+        model.selectUp()
+
+
+def undoRedo(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    um.mergeActions = False
+    insert(model, um, rnd)
+    deleteRange(model, um, rnd)
+    insertMultiline(model, um, rnd)
+    um.mergeActions = True
+
+    while um.undoStack:
+        um.undo()
+    while um.redoStack:
+        um.redo()
+
+
+def revertTo(model: TextEditorModel, um: UndoManager, rnd: random.Random) -> None:
+    um.mergeActions = False
+    insert(model, um, rnd)
+    deleteRange(model, um, rnd)
+    insertMultiline(model, um, rnd)
+    um.mergeActions = True
+
+    start, end = um.getHistoryBounds()
+    for _ in range(20):
+        um.revertTo(rnd.randint(start, end))
+    um.revertTo(start)
+
+
+BENCHMARKS: dict[str, Callable[[TextEditorModel, UndoManager, random.Random], None]] = {
+    "insert": insert,
+    "deleteBefore": deleteBefore,
+    "deleteAfter": deleteAfter,
+    "deleteRange": deleteRange,
+    "insertMultiline": insertMultiline,
+    "copyCutPaste": copyCutPaste,
+    "select": select,
+    "undoRedo": undoRedo,
+    "revertTo": revertTo,
+}
+
+
+def runModel(text: str, document: str, benchmark: str, repeat: int) -> float:
+    um = UndoManager.getInstance()
+    best = float("inf")
+
+    for _ in range(repeat):
+        model = TextEditorModel(text, document)
+        um.clear()
+        um.setModel(model)
+
+        start = perf_counter()
+        BENCHMARKS[benchmark](model, um, random.Random(0))
+        best = min(best, perf_counter() - start)
+
+    um.clear()
+    return best
+
+
+def runRender(text: str, document: str, repeat: int) -> dict[str, float] | None:
+    try:
+        from tkinter import Tk, TclError
+        from text.text_editor import TextEditor
+        from menu.menu_bar import MenuBar
+        from toolbar.toolbar import Toolbar
+        from statusbar.statusbar import Statusbar
+
+        window = Tk()
+    except (ImportError, TclError):
+        return None
+
+    um = UndoManager.getInstance()
+    results = {"drawText": float("inf"), "typing": float("inf")}
+
+    for _ in range(repeat):
+        model = TextEditorModel(text, document)
+        um.clear()
+        um.setModel(model)
+        editor = TextEditor(
+            window,
+            model,
+            ClipboardStack(),
+            um,
+            MenuBar(window),
+            Toolbar(window),
+            Statusbar(window),
+        )
+        window.update()
+
+        start = perf_counter()
+        editor.drawText()
+        window.update()
+        results["drawText"] = min(results["drawText"], perf_counter() - start)
+
+        start = perf_counter()
+        for i in range(200):
+            um.push(model.insert("lorem ipsum "[i % 12]))
+            window.update()
+        results["typing"] = min(results["typing"], perf_counter() - start)
+
+        for child in window.winfo_children():
+            child.destroy()
+
+    window.destroy()
+    um.clear()
+    return results
+
+
+def _revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the editing engine.")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--widths", type=int, nargs="+", default=[80, 10000])
+    parser.add_argument("--max-chars", type=int, default=100_000_000)
+    parser.add_argument("--documents", nargs="+", default=DOCUMENTS)
+    parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tk", action="store_true")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = []
+    for lines in args.lines:
+        for width in args.widths:
+            if lines * width > args.max_chars:
+                continue
+
+            text = makeText(lines, width)
+            for document in args.documents:
+                for benchmark in args.benchmarks:
+                    seconds = runModel(text, document, benchmark, args.repeat)
+                    results.append(
+                        {
+                            "benchmark": benchmark,
+                            "document": document,
+                            "lines": lines,
+                            "width": width,
+                            "seconds": seconds,
+                        }
+                    )
+                    print(
+                        f"{benchmark:16}{document:>12}{lines:>10}{width:>7}"
+                        f"{seconds * 1000:>12.2f}ms",
+                        file=sys.stderr,
+                    )
+
+                if not args.tk:
+                    continue
+
+                render = runRender(text, document, args.repeat)
+                if render is None:
+                    print("tk unavailable, skipping render", file=sys.stderr)
+                    args.tk = False
+                    continue
+
+                for benchmark, seconds in render.items():
+                    results.append(
+                        {
+                            "benchmark": f"render.{benchmark}",
+                            "document": document,
+                            "lines": lines,
+                            "width": width,
+                            "seconds": seconds,
+                        }
+                    )
+
+    report = {
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+from time import perf_counter
+from benchmarks.document_benchmark import DOCUMENTS, makeText
+from location.location import Location
+from search.search_engine import SearchEngine
+from text.text_editor_model import TextEditorModel
+
+PATTERNS: list[tuple[str, bool]] = [
+    ("needle", False),
+    ("haystack", False),
+    (r"ne+dle\s+in", True),
+    ("lorem", False),
+]
+
+
+def makeDocument(lines: int, width: int) -> str:
+    rows = makeText(lines, width).split("\n")
+    rows[lines * 3 // 4] += " needle in a haystack"
+    return "\n".join(rows)
+
+
+def query(engine: SearchEngine, pattern: str, regex: bool) -> float:
+    engine.setPattern(pattern, regex)
+    start = perf_counter()
+
+    for match in engine.search(Location(0, 0), True):
+        if match is not None:
+            break
+
+    return perf_counter() - start
+
+
+def measure(text: str, document: str, repeat: int) -> dict[str, float]:
+    model = TextEditorModel(text, document)
+    engine = SearchEngine(model)
+    result = {}
+
+    for pattern, regex in PATTERNS:
+        result[f"scan:{pattern}"] = min(
+            query(engine, pattern, regex) for _ in range(repeat)
+        )
+
+    engine.enableIndex()
+    assert engine.index is not None
+
+    start = perf_counter()
+    for _ in engine.index.build():
+        pass
+    result["build"] = perf_counter() - start
+
+    for pattern, regex in PATTERNS:
+        result[f"index:{pattern}"] = min(
+            query(engine, pattern, regex) for _ in range(repeat)
+        )
+
+    result["indexBytes"] = engine.index.memoryUsage()
+    result["overhead"] = result["indexBytes"] / max(model.textLength(), 1)
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare indexed and plain search.")
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--documents", nargs="+", default=DOCUMENTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = makeDocument(args.lines, args.width)
+    results = []
+
+    for document in args.documents:
+        result = measure(text, document, args.repeat)
+        results.append({"document": document, **result})
+
+        print(f"{document}: index build {result['build']:.2f}s", file=sys.stderr)
+        for pattern, _ in PATTERNS:
+            print(
+                f"  {pattern:14}{result[f'scan:{pattern}'] * 1000:>12.2f}ms"
+                f"{result[f'index:{pattern}'] * 1000:>12.2f}ms",
+                file=sys.stderr,
+            )
+        print(
+            f"  index memory {result['indexBytes'] / 1024:.1f} KiB"
+            f" ({result['overhead']:.1%} of the text)",
+            file=sys.stderr,
+        )
+
+    json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+from importlib import import_module
+from itertools import islice
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+LineDiff = tuple[int, int, str, str]
+
+REBUILD_RATIO: int = 32
+COMPARE_LINES: int = 4096
+
+
+class Document(ABC):
+    @abstractmethod
+    def lineCount(self) -> int:
+        pass
+
+    @abstractmethod
+    def getLine(self, row: int) -> str:
+        pass
+
+    def lineLength(self, row: int) -> int:
+        return len(self.getLine(row))
+
+    def allLines(self) -> Iterator[str]:
+        return self.linesRange(0, self.lineCount())
+
+    def linesRange(self, index1: int, index2: int) -> Iterator[str]:
+        for row in range(index1, min(index2, self.lineCount())):
+            yield self.getLine(row)
+
+    def getLines(self) -> list[str]:
+        return list(self.allLines())
+
+    @abstractmethod
+    def getText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        pass
+
+    @abstractmethod
+    def insert(self, row: int, col: int, text: str) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        pass
+
+    @abstractmethod
+    def setLines(self, lines: list[str]) -> None:
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> Document:
+        pass
+
+    def snapshotSize(self) -> int:
+        return 0
+
+    def appendLines(self, lines: list[str]) -> None:
+        row = self.lineCount() - 1
+        self.insert(row, self.lineLength(row), "\n" + "\n".join(lines))
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        if len(diffs) * REBUILD_RATIO >= self.lineCount():
+            self.setLines(applyLineDiffs(self.allLines(), diffs))
+            return
+
+        for row, col, removed, inserted in reversed(diffs):
+            self.delete(row, col, *textEnd(row, col, removed))
+            self.insert(row, col, inserted)
+
+
+def textEnd(row: int, col: int, text: str) -> tuple[int, int]:
+    newlines = text.count("\n")
+    if not newlines:
+        return row, col + len(text)
+
+    return row + newlines, len(text) - text.rfind("\n") - 1
+
+
+def applyLineDiffs(lines: Iterable[str], diffs: list[LineDiff]) -> list[str]:
+    lines = iter(lines)
+    result = []
+    position = 0
+
+    for row, col, removed, inserted in diffs:
+        e_row, e_col = textEnd(row, col, removed)
+        block = list(islice(lines, e_row - position + 1))
+
+        result.extend(block[: row - position])
+        result.extend(
+            (block[row - position][:col] + inserted + block[-1][e_col:]).split("\n")
+        )
+        position = e_row + 1
+
+    result.extend(lines)
+    return result
+
+
+def commonPrefix(old: Document, new: Document, limit: int) -> int:
+    start = 0
+
+    while start < limit:
+        stop = min(start + COMPARE_LINES, limit)
+        oldLines = list(old.linesRange(start, stop))
+        newLines = list(new.linesRange(start, stop))
+
+        if oldLines != newLines:
+            pairs = enumerate(zip(oldLines, newLines))
+            return start + next(index for index, (a, b) in pairs if a != b)
+
+        start = stop
+
+    return limit
+
+
+def commonSuffix(old: Document, new: Document, limit: int) -> int:
+    oldCount = old.lineCount()
+    newCount = new.lineCount()
+    end = 0
+
+    while end < limit:
+        size = min(COMPARE_LINES, limit - end)
+        oldLines = list(old.linesRange(oldCount - end - size, oldCount - end))
+        newLines = list(new.linesRange(newCount - end - size, newCount - end))
+
+        if oldLines != newLines:
+            pairs = enumerate(zip(reversed(oldLines), reversed(newLines)))
+            return end + next(index for index, (a, b) in pairs if a != b)
+
+        end += size
+
+    return limit
+
+
+def documentFactory(documentName: str) -> Callable[[str], Document]:
+    className = "".join([part.capitalize() for part in documentName.split("_")])
+    return getattr(
+        import_module(f"document.{documentName}_document"), f"{className}Document"
+    )
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import sys
+from document.document import Document, applyLineDiffs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from document.document import LineDiff
+
+
+class ListDocument(Document):
+    def __init__(self, text: str) -> None:
+        self.lines: list[str] = text.split("\n")
+
+    def lineCount(self) -> int:
+        return len(self.lines)
+
+    def getLine(self, row: int) -> str:
+        return self.lines[row]
+
+    def lineLength(self, row: int) -> int:
+        return len(self.lines[row])
+
+    def allLines(self) -> Iterator[str]:
+        return iter(self.lines)
+
+    def linesRange(self, index1: int, index2: int) -> Iterator[str]:
+        return iter(self.lines[index1:index2])
+
+    def getLines(self) -> list[str]:
+        return self.lines
+
+    def getText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        if s_row == e_row:
+            return self.lines[s_row][s_col:e_col]
+
+        lines = self.lines[s_row : e_row + 1]
+        lines[0] = lines[0][s_col:]
+        lines[-1] = lines[-1][:e_col]
+
+        return "\n".join(lines)
+
+    def insert(self, row: int, col: int, text: str) -> None:
+        line = self.lines[row]
+
+        if "\n" not in text:
+            self.lines[row] = line[:col] + text + line[col:]
+            return
+
+        lines = text.split("\n")
+        lines[0] = line[:col] + lines[0]
+        lines[-1] = lines[-1] + line[col:]
+        self.lines[row : row + 1] = lines
+
+    def delete(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        text = self.getText(s_row, s_col, e_row, e_col)
+        line = self.lines[s_row][:s_col] + self.lines[e_row][e_col:]
+        self.lines[s_row : e_row + 1] = [line]
+
+        return text
+
+    def setLines(self, lines: list[str]) -> None:
+        self.lines = [""] if not lines else lines
+
+    def appendLines(self, lines: list[str]) -> None:
+        self.lines.extend(lines)
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        lines = self.lines
+
+        if not any(
+            "\n" in removed or "\n" in inserted for _, _, removed, inserted in diffs
+        ):
+            for row, col, removed, inserted in diffs:
+                line = lines[row]
+                lines[row] = line[:col] + inserted + line[col + len(removed) :]
+            return
+
+        self.lines = applyLineDiffs(lines, diffs)
+
+    def snapshot(self) -> ListDocument:
+        document = ListDocument.__new__(ListDocument)
+        document.lines = self.lines[:]
+        return document
+
+    def snapshotSize(self) -> int:
+        return sys.getsizeof(self.lines)
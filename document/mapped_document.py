@@ -0,0 +1,262 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from array import array
+from bisect import bisect_right
+from codecs import getincrementaldecoder
+from functools import partial
+from itertools import accumulate
+import mmap
+import sys
+from document.document import Document
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+CHUNK_SIZE = 1 << 20
+
+
+class MappedDocument(Document):
+    def __init__(self, text: str) -> None:
+        buffer = text.encode("utf-8")
+        chunks = (
+            buffer[start : start + CHUNK_SIZE]
+            for start in range(0, len(buffer), CHUNK_SIZE)
+        )
+        self._load(buffer, chunks, False)
+        self.path: str | None = None
+
+    @classmethod
+    def fromFile(cls, path: str, splitLines: bool = True) -> MappedDocument:
+        document = cls.__new__(cls)
+        document.path = path
+
+        with open(path, "rb") as file:
+            if file.seek(0, 2) == 0:
+                document._load(b"", (), splitLines)
+            else:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                file.seek(0)
+                chunks = iter(partial(file.read, CHUNK_SIZE), b"")
+                document._load(buffer, chunks, splitLines)
+
+        return document
+
+    def _load(
+        self, buffer: bytes | mmap.mmap, chunks: Iterable[bytes], splitLines: bool
+    ) -> None:
+        self.buffer: bytes | mmap.mmap = buffer
+        self.splitLines: bool = splitLines
+        self.chunkNewlines: array[int] = array("Q", [0])
+        self.chunkOffsets: dict[int, array[int]] = {}
+        self.loneReturns: bool = False
+
+        decoder = getincrementaldecoder("utf-8")()
+        pendingReturn = False
+
+        for chunk in chunks:
+            decoder.decode(chunk)
+            self.chunkNewlines.append(self.chunkNewlines[-1] + chunk.count(b"\n"))
+
+            if splitLines:
+                if pendingReturn and chunk[:1] != b"\n":
+                    self.loneReturns = True
+
+                pendingReturn = chunk[-1:] == b"\r"
+                if b"\r" in chunk:
+                    returns = chunk.count(b"\r") - chunk.count(b"\r\n")
+                    self.loneReturns |= returns > pendingReturn
+
+        decoder.decode(b"", True)
+        if pendingReturn:
+            self.loneReturns = True
+
+        newlines = self.chunkNewlines[-1]
+        self.sourceRows: int = newlines + 1
+        if splitLines and self.sourceRows > 1 and buffer[-1:] == b"\n":
+            self.sourceRows -= 1
+
+        self.segments: list[range | list[str]] = [range(self.sourceRows)]
+        self.segmentStarts: list[int] = [0]
+        self.rowCount: int = self.sourceRows
+
+    def _offsets(self, chunk: int) -> array[int]:
+        offsets = self.chunkOffsets.get(chunk)
+
+        if offsets is None:
+            start = chunk * CHUNK_SIZE
+            parts = self.buffer[start : start + CHUNK_SIZE].split(b"\n")[:-1]
+            offsets = array(
+                "Q", accumulate((len(part) + 1 for part in parts), initial=start)
+            )
+            offsets.pop(0)
+            self.chunkOffsets[chunk] = offsets
+
+        return offsets
+
+    def _rowStart(self, row: int) -> int:
+        if row == 0:
+            return 0
+
+        newline = row - 1
+        chunk = bisect_right(self.chunkNewlines, newline) - 1
+
+        return self._offsets(chunk)[newline - self.chunkNewlines[chunk]]
+
+    def _rowEnd(self, row: int) -> int:
+        if row + 1 <= self.chunkNewlines[-1]:
+            return self._rowStart(row + 1) - 1
+
+        return len(self.buffer)
+
+    def _sourceLine(self, row: int) -> str:
+        line = self.buffer[self._rowStart(row) : self._rowEnd(row)]
+        if self.splitLines and line[-1:] == b"\r":
+            line = line[:-1]
+
+        return line.decode("utf-8")
+
+    def _sourceLines(self, rows: range) -> list[str]:
+        data = self.buffer[self._rowStart(rows[0]) : self._rowEnd(rows[-1])]
+        lines = data.decode("utf-8").split("\n")
+
+        if self.splitLines:
+            lines = [line[:-1] if line[-1:] == "\r" else line for line in lines]
+
+        return lines
+
+    def _locate(self, row: int) -> tuple[int, int]:
+        index = bisect_right(self.segmentStarts, row) - 1
+        return index, row - self.segmentStarts[index]
+
+    def lineCount(self) -> int:
+        return self.rowCount
+
+    def getLine(self, row: int) -> str:
+        if row < 0:
+            row += self.rowCount
+        if not 0 <= row < self.rowCount:
+            raise IndexError(row)
+
+        index, offset = self._locate(row)
+        segment = self.segments[index]
+
+        if isinstance(segment, range):
+            return self._sourceLine(segment[offset])
+
+        return segment[offset]
+
+    def linesRange(self, index1: int, index2: int) -> Iterator[str]:
+        index2 = min(index2, self.rowCount)
+        if index1 >= index2:
+            return
+
+        index, offset = self._locate(index1)
+        remaining = index2 - index1
+
+        while remaining > 0:
+            segment = self.segments[index]
+            part = segment[offset : offset + remaining]
+
+            if isinstance(part, range):
+                for start in range(0, len(part), 1024):
+                    yield from self._sourceLines(part[start : start + 1024])
+            else:
+                yield from part
+
+            remaining -= len(part)
+            index, offset = index + 1, 0
+
+    def getText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        if s_row == e_row:
+            return self.getLine(s_row)[s_col:e_col]
+
+        lines = list(self.linesRange(s_row, e_row + 1))
+        lines[0] = lines[0][s_col:]
+        lines[-1] = lines[-1][:e_col]
+
+        return "\n".join(lines)
+
+    def insert(self, row: int, col: int, text: str) -> None:
+        line = self.getLine(row)
+
+        lines = text.split("\n")
+        lines[0] = line[:col] + lines[0]
+        lines[-1] = lines[-1] + line[col:]
+        self._replaceRows(row, row, lines)
+
+    def delete(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        text = self.getText(s_row, s_col, e_row, e_col)
+        line = self.getLine(s_row)[:s_col] + self.getLine(e_row)[e_col:]
+        self._replaceRows(s_row, e_row, [line])
+
+        return text
+
+    def setLines(self, lines: list[str]) -> None:
+        self.segments = [lines if lines else [""]]
+        self.segmentStarts = [0]
+        self.rowCount = len(self.segments[0])
+
+    def snapshot(self) -> MappedDocument:
+        document = MappedDocument.__new__(MappedDocument)
+        document.buffer = self.buffer
+        document.path = self.path
+        document.splitLines = self.splitLines
+        document.loneReturns = self.loneReturns
+        document.chunkNewlines = self.chunkNewlines
+        document.chunkOffsets = self.chunkOffsets
+        document.sourceRows = self.sourceRows
+        document.rowCount = self.rowCount
+        document.segments = [
+            segment if isinstance(segment, range) else segment[:]
+            for segment in self.segments
+        ]
+        document.segmentStarts = self.segmentStarts[:]
+        return document
+
+    def isPristine(self) -> bool:
+        return self.path is not None and self.segments == [range(self.sourceRows)]
+
+    def snapshotSize(self) -> int:
+        return (
+            sys.getsizeof(self.segments)
+            + sys.getsizeof(self.segmentStarts)
+            + sum(
+                sys.getsizeof(segment)
+                for segment in self.segments
+                if not isinstance(segment, range)
+            )
+        )
+
+    def _replaceRows(self, s_row: int, e_row: int, lines: list[str]) -> None:
+        delta = len(lines) - (e_row - s_row + 1)
+        self.rowCount += delta
+
+        first, s_offset = self._locate(s_row)
+        last, e_offset = self._locate(e_row)
+        segment = self.segments[first]
+
+        if first == last and isinstance(segment, list):
+            segment[s_offset : e_offset + 1] = lines
+
+            if delta:
+                starts = self.segmentStarts
+                starts[first + 1 :] = [start + delta for start in starts[first + 1 :]]
+            return
+
+        head = segment[:s_offset]
+        tail = self.segments[last][e_offset + 1 :]
+
+        if isinstance(head, list):
+            lines = head + lines
+            head = range(0)
+        if isinstance(tail, list):
+            lines = lines + tail
+            tail = range(0)
+
+        pieces = [piece for piece in (head, lines, tail) if len(piece)]
+        self.segments[first : last + 1] = pieces
+
+        self.segmentStarts[first:] = accumulate(
+            (len(piece) for piece in self.segments[first:-1]),
+            initial=self.segmentStarts[first],
+        )
@@ -0,0 +1,231 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from array import array
+from bisect import bisect_right
+import sys
+from itertools import accumulate, islice
+from document.document import Document
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+ADD_CHUNK_SIZE: int = 4096
+
+
+class _Piece:
+    __slots__ = ("buffer", "start", "length", "newlines")
+
+    def __init__(self, buffer: int, start: int, length: int, newlines: int) -> None:
+        self.buffer: int = buffer
+        self.start: int = start
+        self.length: int = length
+        self.newlines: int = newlines
+
+
+class PieceTableDocument(Document):
+    def __init__(self, text: str) -> None:
+        self._reset(text)
+
+    def _reset(self, text: str) -> None:
+        self.buffers: list[str] = [text]
+        self.breaks: list[array[int]] = [self._findBreaks(text)]
+        self.pieces: list[_Piece] = []
+        self.length: int = len(text)
+        self.lineTotal: int = len(self.breaks[0]) + 1
+
+        if text:
+            self.pieces.append(_Piece(0, 0, len(text), len(self.breaks[0])))
+
+    def _findBreaks(self, text: str, offset: int = 0) -> array[int]:
+        breaks = array("q", accumulate(len(line) + 1 for line in text.split("\n")))
+        breaks.pop()
+
+        if offset:
+            return array("q", (b + offset for b in breaks))
+        return breaks
+
+    def _countNewlines(self, buffer: int, start: int, length: int) -> int:
+        breaks = self.breaks[buffer]
+        return bisect_right(breaks, start + length) - bisect_right(breaks, start)
+
+    def _lineStart(self, row: int) -> int:
+        if row == 0:
+            return 0
+
+        offset = 0
+        for piece in self.pieces:
+            if row <= piece.newlines:
+                breaks = self.breaks[piece.buffer]
+                index = bisect_right(breaks, piece.start) + row - 1
+                return offset + breaks[index] - piece.start
+
+            row -= piece.newlines
+            offset += piece.length
+
+        raise IndexError("line index out of range")
+
+    def _split(self, offset: int) -> int:
+        position = 0
+
+        for i, piece in enumerate(self.pieces):
+            if offset == position:
+                return i
+
+            end = position + piece.length
+            if offset < end:
+                cut = offset - position
+                left_newlines = self._countNewlines(piece.buffer, piece.start, cut)
+                self.pieces[i : i + 1] = [
+                    _Piece(piece.buffer, piece.start, cut, left_newlines),
+                    _Piece(
+                        piece.buffer,
+                        piece.start + cut,
+                        piece.length - cut,
+                        piece.newlines - left_newlines,
+                    ),
+                ]
+                return i + 1
+
+            position = end
+
+        return len(self.pieces)
+
+    def _read(self, start: int, end: int) -> str:
+        parts = []
+        position = 0
+
+        for piece in self.pieces:
+            if position >= end:
+                break
+
+            piece_end = position + piece.length
+            if piece_end > start:
+                lo = piece.start + max(start - position, 0)
+                hi = piece.start + min(end, piece_end) - position
+                parts.append(self.buffers[piece.buffer][lo:hi])
+
+            position = piece_end
+
+        return "".join(parts)
+
+    def _iterLines(self, offset: int) -> Iterator[str]:
+        pending = []
+        position = 0
+
+        for piece in self.pieces:
+            piece_end = position + piece.length
+            if piece_end <= offset:
+                position = piece_end
+                continue
+
+            text = self.buffers[piece.buffer]
+            breaks = self.breaks[piece.buffer]
+            lo = piece.start + max(offset - position, 0)
+            hi = piece.start + piece.length
+
+            for index in range(bisect_right(breaks, lo), bisect_right(breaks, hi)):
+                pending.append(text[lo : breaks[index] - 1])
+                yield "".join(pending)
+                pending = []
+                lo = breaks[index]
+
+            pending.append(text[lo:hi])
+            position = piece_end
+
+        yield "".join(pending)
+
+    def lineCount(self) -> int:
+        return self.lineTotal
+
+    def getLine(self, row: int) -> str:
+        if not 0 <= row < self.lineTotal:
+            raise IndexError("line index out of range")
+
+        return next(self._iterLines(self._lineStart(row)))
+
+    def allLines(self) -> Iterator[str]:
+        return self._iterLines(0)
+
+    def linesRange(self, index1: int, index2: int) -> Iterator[str]:
+        index2 = min(index2, self.lineTotal)
+        if index1 >= index2:
+            return iter(())
+
+        return islice(self._iterLines(self._lineStart(index1)), index2 - index1)
+
+    def getText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        return self._read(
+            self._lineStart(s_row) + s_col, self._lineStart(e_row) + e_col
+        )
+
+    def insert(self, row: int, col: int, text: str) -> None:
+        if not text:
+            return
+
+        offset = self._lineStart(row) + col
+        buffer = len(self.buffers) - 1
+
+        if buffer > 0 and len(self.buffers[buffer]) + len(text) <= ADD_CHUNK_SIZE:
+            start = len(self.buffers[buffer])
+            self.buffers[buffer] += text
+            self.breaks[buffer].extend(self._findBreaks(text, start))
+        else:
+            buffer += 1
+            start = 0
+            self.buffers.append(text)
+            self.breaks.append(self._findBreaks(text))
+
+        newlines = text.count("\n")
+        index = self._split(offset)
+        previous = self.pieces[index - 1] if index > 0 else None
+
+        if (
+            previous is not None
+            and previous.buffer == buffer
+            and previous.start + previous.length == start
+        ):
+            self.pieces[index - 1] = _Piece(
+                buffer,
+                previous.start,
+                previous.length + len(text),
+                previous.newlines + newlines,
+            )
+        else:
+            self.pieces.insert(index, _Piece(buffer, start, len(text), newlines))
+
+        self.length += len(text)
+        self.lineTotal += newlines
+
+    def delete(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        start = self._lineStart(s_row) + s_col
+        end = self._lineStart(e_row) + e_col
+        if start >= end:
+            return ""
+
+        i = self._split(start)
+        j = self._split(end)
+        removed = self.pieces[i:j]
+        del self.pieces[i:j]
+
+        self.length -= end - start
+        self.lineTotal -= sum(piece.newlines for piece in removed)
+
+        return "".join(
+            self.buffers[piece.buffer][piece.start : piece.start + piece.length]
+            for piece in removed
+        )
+
+    def setLines(self, lines: list[str]) -> None:
+        self._reset("\n".join(lines))
+
+    def snapshot(self) -> PieceTableDocument:
+        document = PieceTableDocument.__new__(PieceTableDocument)
+        document.buffers = self.buffers
+        document.breaks = self.breaks
+        document.pieces = self.pieces[:]
+        document.length = self.length
+        document.lineTotal = self.lineTotal
+        return document
+
+    def snapshotSize(self) -> int:
+        return sys.getsizeof(self.pieces)
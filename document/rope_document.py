@@ -0,0 +1,258 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union
+from itertools import islice
+from document.document import Document
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+LEAF_SIZE: int = 2048
+
+
+class _Leaf:
+    __slots__ = ("text", "length", "newlines", "height")
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        self.length: int = len(text)
+        self.newlines: int = text.count("\n")
+        self.height: int = 0
+
+
+class _Node:
+    __slots__ = ("left", "right", "length", "newlines", "height")
+
+    def __init__(self, left: _Rope, right: _Rope) -> None:
+        self.left: _Rope = left
+        self.right: _Rope = right
+        self.length: int = left.length + right.length
+        self.newlines: int = left.newlines + right.newlines
+        self.height: int = max(left.height, right.height) + 1
+
+
+_Rope = Union[_Leaf, _Node]
+
+
+def _build(text: str) -> _Rope | None:
+    leaves = [_Leaf(text[i : i + LEAF_SIZE]) for i in range(0, len(text), LEAF_SIZE)]
+    return _buildBalanced(leaves, 0, len(leaves))
+
+
+def _buildBalanced(leaves: list[_Leaf], lo: int, hi: int) -> _Rope | None:
+    if lo == hi:
+        return None
+    if hi - lo == 1:
+        return leaves[lo]
+
+    mid = (lo + hi) // 2
+    left = _buildBalanced(leaves, lo, mid)
+    right = _buildBalanced(leaves, mid, hi)
+    assert left is not None and right is not None
+
+    return _Node(left, right)
+
+
+def _balance(left: _Rope, right: _Rope) -> _Rope:
+    if left.height > right.height + 1:
+        assert isinstance(left, _Node)
+        if left.left.height >= left.right.height:
+            return _Node(left.left, _Node(left.right, right))
+
+        inner = left.right
+        assert isinstance(inner, _Node)
+        return _Node(_Node(left.left, inner.left), _Node(inner.right, right))
+
+    if right.height > left.height + 1:
+        assert isinstance(right, _Node)
+        if right.right.height >= right.left.height:
+            return _Node(_Node(left, right.left), right.right)
+
+        inner = right.left
+        assert isinstance(inner, _Node)
+        return _Node(_Node(left, inner.left), _Node(inner.right, right.right))
+
+    return _Node(left, right)
+
+
+def _concat(left: _Rope | None, right: _Rope | None) -> _Rope | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.height > right.height + 1:
+        assert isinstance(left, _Node)
+        joined = _concat(left.right, right)
+        assert joined is not None
+        return _balance(left.left, joined)
+
+    if right.height > left.height + 1:
+        assert isinstance(right, _Node)
+        joined = _concat(left, right.left)
+        assert joined is not None
+        return _balance(joined, right.right)
+
+    if (
+        isinstance(left, _Leaf)
+        and isinstance(right, _Leaf)
+        and left.length + right.length <= LEAF_SIZE
+    ):
+        return _Leaf(left.text + right.text)
+
+    return _Node(left, right)
+
+
+def _split(node: _Rope | None, offset: int) -> tuple[_Rope | None, _Rope | None]:
+    if node is None or offset <= 0:
+        return None, node
+    if offset >= node.length:
+        return node, None
+
+    if isinstance(node, _Leaf):
+        return _Leaf(node.text[:offset]), _Leaf(node.text[offset:])
+
+    if offset < node.left.length:
+        left, right = _split(node.left, offset)
+        return left, _concat(right, node.right)
+
+    left, right = _split(node.right, offset - node.left.length)
+    return _concat(node.left, left), right
+
+
+def _chunks(node: _Rope | None, offset: int) -> Iterator[str]:
+    stack: list[_Rope] = []
+
+    while isinstance(node, _Node):
+        if offset < node.left.length:
+            stack.append(node.right)
+            node = node.left
+        else:
+            offset -= node.left.length
+            node = node.right
+
+    if node is None:
+        return
+
+    yield node.text[offset:]
+
+    while stack:
+        node = stack.pop()
+        while isinstance(node, _Node):
+            stack.append(node.right)
+            node = node.left
+
+        yield node.text
+
+
+class RopeDocument(Document):
+    def __init__(self, text: str) -> None:
+        self.root: _Rope | None = _build(text)
+
+    def _length(self) -> int:
+        return self.root.length if self.root else 0
+
+    def _lineStart(self, row: int) -> int:
+        if row == 0:
+            return 0
+
+        node = self.root
+        if node is None or row > node.newlines:
+            raise IndexError("line index out of range")
+
+        offset = 0
+        while isinstance(node, _Node):
+            if row <= node.left.newlines:
+                node = node.left
+            else:
+                row -= node.left.newlines
+                offset += node.left.length
+                node = node.right
+
+        index = -1
+        for _ in range(row):
+            index = node.text.index("\n", index + 1)
+
+        return offset + index + 1
+
+    def _read(self, start: int, end: int) -> str:
+        parts = []
+        remaining = end - start
+
+        for chunk in _chunks(self.root, start):
+            if remaining <= 0:
+                break
+
+            parts.append(chunk[:remaining])
+            remaining -= len(chunk)
+
+        return "".join(parts)
+
+    def _iterLines(self, offset: int) -> Iterator[str]:
+        pending = []
+
+        for chunk in _chunks(self.root, offset):
+            parts = chunk.split("\n")
+
+            for part in parts[:-1]:
+                pending.append(part)
+                yield "".join(pending)
+                pending = []
+
+            pending.append(parts[-1])
+
+        yield "".join(pending)
+
+    def lineCount(self) -> int:
+        return self.root.newlines + 1 if self.root else 1
+
+    def getLine(self, row: int) -> str:
+        if not 0 <= row < self.lineCount():
+            raise IndexError("line index out of range")
+
+        start = self._lineStart(row)
+        if row + 1 < self.lineCount():
+            return self._read(start, self._lineStart(row + 1) - 1)
+
+        return self._read(start, self._length())
+
+    def allLines(self) -> Iterator[str]:
+        return self._iterLines(0)
+
+    def linesRange(self, index1: int, index2: int) -> Iterator[str]:
+        index2 = min(index2, self.lineCount())
+        if index1 >= index2:
+            return iter(())
+
+        return islice(self._iterLines(self._lineStart(index1)), index2 - index1)
+
+    def getText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        return self._read(
+            self._lineStart(s_row) + s_col, self._lineStart(e_row) + e_col
+        )
+
+    def insert(self, row: int, col: int, text: str) -> None:
+        if not text:
+            return
+
+        left, right = _split(self.root, self._lineStart(row) + col)
+        self.root = _concat(_concat(left, _build(text)), right)
+
+    def delete(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        start = self._lineStart(s_row) + s_col
+        end = self._lineStart(e_row) + e_col
+        if start >= end:
+            return ""
+
+        left, rest = _split(self.root, start)
+        middle, right = _split(rest, end - start)
+        self.root = _concat(left, right)
+
+        return "".join(_chunks(middle, 0))
+
+    def setLines(self, lines: list[str]) -> None:
+        self.root = _build("\n".join(lines))
+
+    def snapshot(self) -> RopeDocument:
+        document = RopeDocument.__new__(RopeDocument)
+        document.root = self.root
+        return document
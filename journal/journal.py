@@ -0,0 +1,342 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, BinaryIO
+from contextlib import suppress
+from itertools import islice
+from threading import Thread
+import json
+import os
+import re
+import struct
+import tempfile
+import zlib
+from text.edit_observer import EditObserver
+from document.document import REBUILD_RATIO, textEnd
+from document.mapped_document import MappedDocument
+from journal.session_lock import LOCK_NAME, SessionLock
+
+if TYPE_CHECKING:
+    from document.document import Document, LineDiff
+    from text.text_editor_model import TextEditorModel
+
+INSERT: int = 1
+DELETE: int = 2
+RESET: int = 3
+
+HEADER = struct.Struct("<IIB")
+INSERT_BODY = struct.Struct("<II")
+DELETE_BODY = struct.Struct("<IIII")
+
+FILE_PATTERN = re.compile(r"(snapshot|source|journal)-(\d{8})\.(txt|json|bin)$")
+EXTENSIONS: dict[str, str] = {"snapshot": "txt", "source": "json", "journal": "bin"}
+SNAPSHOT_CHUNK_LINES: int = 4096
+TEMP_PREFIX: str = ".snapshot-"
+SESSION_PREFIX: str = "session-"
+
+
+class Journal(EditObserver):
+    def __init__(
+        self,
+        directory: str,
+        snapshotRecords: int = 100_000,
+        snapshotBytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.root: str = directory
+        self.directory: str | None = None
+        self.lock: SessionLock | None = None
+        self.snapshotRecords: int = snapshotRecords
+        self.snapshotBytes: int = snapshotBytes
+
+        self.model: TextEditorModel | None = None
+        self.generation: int = 0
+        self.file: BinaryIO | None = None
+        self.records: int = 0
+        self.bytes: int = 0
+        self.snapshotThreads: list[Thread] = []
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind: str, generation: int) -> str:
+        assert self.directory is not None
+        return os.path.join(
+            self.directory, f"{kind}-{generation:08d}.{EXTENSIONS[kind]}"
+        )
+
+    def _files(self) -> dict[str, list[int]]:
+        files: dict[str, list[int]] = {kind: [] for kind in EXTENSIONS}
+
+        assert self.directory is not None
+        for name in os.listdir(self.directory):
+            match = FILE_PATTERN.match(name)
+            if match:
+                files[match.group(1)].append(int(match.group(2)))
+
+        for generations in files.values():
+            generations.sort()
+
+        return files
+
+    @staticmethod
+    def _lastGeneration(files: dict[str, list[int]]) -> int:
+        return max(
+            (
+                generation
+                for generations in files.values()
+                for generation in generations
+            ),
+            default=-1,
+        )
+
+    def recover(self) -> Document | None:
+        for name in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, name)
+            if not name.startswith(SESSION_PREFIX) or not os.path.isdir(directory):
+                continue
+
+            lock = SessionLock.acquire(directory)
+            if lock is None:
+                continue
+
+            self._closeSession()
+            self.directory = directory
+            self.lock = lock
+
+            files = self._files()
+            bases = [
+                generation
+                for generation in files["snapshot"] + files["source"]
+                if generation in files["journal"]
+            ]
+            if bases:
+                return self._recoverSession(files, max(bases))
+
+            self._removeBefore(self._lastGeneration(files) + 1)
+
+        self._closeSession()
+        return None
+
+    def _recoverSession(
+        self, files: dict[str, list[int]], base: int
+    ) -> Document | None:
+        if base in files["source"]:
+            with open(self._path("source", base), encoding="utf-8") as file:
+                source = json.load(file)
+
+            try:
+                stat = os.stat(source["path"])
+            except OSError:
+                return None
+
+            if [stat.st_size, stat.st_mtime_ns] != source["stamp"]:
+                return None
+
+            document = MappedDocument.fromFile(source["path"])
+        else:
+            path = self._path("snapshot", base)
+            document = MappedDocument.fromFile(path, splitLines=False)
+
+        for generation in files["journal"]:
+            if generation < base:
+                continue
+            if not self._replay(document, generation, generation == base):
+                break
+
+        return document
+
+    def _replay(self, document: Document, generation: int, isBase: bool) -> bool:
+        with open(self._path("journal", generation), "rb") as file:
+            data = file.read()
+
+        if data[:1] == bytes([RESET]) and not isBase:
+            return False
+
+        offset = 1
+        while offset + HEADER.size <= len(data):
+            crc, length, op = HEADER.unpack_from(data, offset)
+            start = offset + HEADER.size
+            body = data[start : start + length]
+
+            if len(body) < length or zlib.crc32(body, op) != crc:
+                break
+
+            if op == INSERT:
+                row, col = INSERT_BODY.unpack_from(body)
+                document.insert(row, col, body[INSERT_BODY.size :].decode("utf-8"))
+            elif op == DELETE:
+                document.delete(*DELETE_BODY.unpack(body))
+
+            offset = start + length
+
+        return True
+
+    def attach(self, model: TextEditorModel) -> None:
+        if self.directory is None:
+            directory = tempfile.mkdtemp(prefix=SESSION_PREFIX, dir=self.root)
+            self.directory = directory
+            self.lock = SessionLock.acquire(directory)
+
+        self.model = model
+        files = self._files()
+        self.generation = self._lastGeneration(files)
+
+        for name in os.listdir(self.directory):
+            if name.startswith(TEMP_PREFIX):
+                os.unlink(os.path.join(self.directory, name))
+
+        model.addEditObserver(self)
+        self.resetText(model.document)
+
+    def close(self) -> None:
+        if self.model:
+            self.model.removeEditObserver(self)
+            self.model = None
+
+        for thread in self.snapshotThreads:
+            thread.join()
+        self.snapshotThreads = []
+
+        if self.file:
+            self.file.close()
+            self.file = None
+
+        if self.directory is not None:
+            self._removeBefore(self.generation + 1)
+        self._closeSession()
+
+    def _closeSession(self) -> None:
+        if self.directory is None:
+            return
+
+        files = self._files()
+        if not any(files.values()):
+            with suppress(OSError):
+                os.unlink(os.path.join(self.directory, LOCK_NAME))
+                os.rmdir(self.directory)
+
+        if self.lock:
+            self.lock.release()
+
+        self.directory = None
+        self.lock = None
+
+    def insertText(self, row: int, col: int, text: str) -> None:
+        self._write(INSERT, INSERT_BODY.pack(row, col) + text.encode("utf-8"))
+        self._checkSnapshot()
+
+    def deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> None:
+        self._write(DELETE, DELETE_BODY.pack(s_row, s_col, e_row, e_col))
+        self._checkSnapshot()
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        if self.model and len(diffs) * REBUILD_RATIO >= self.model.lineCount():
+            self._rotate(self.model.document, True)
+            return
+
+        for row, col, removed, inserted in reversed(diffs):
+            e_row, e_col = textEnd(row, col, removed)
+            self._write(DELETE, DELETE_BODY.pack(row, col, e_row, e_col))
+            self._write(INSERT, INSERT_BODY.pack(row, col) + inserted.encode("utf-8"))
+
+        self._checkSnapshot()
+
+    def resetText(self, document: Document) -> None:
+        self._rotate(document, True)
+
+    def _write(self, op: int, body: bytes) -> None:
+        if self.file is None:
+            return
+
+        self.file.write(HEADER.pack(zlib.crc32(body, op), len(body), op) + body)
+        self.file.flush()
+
+        self.records += 1
+        self.bytes += HEADER.size + len(body)
+
+    def _checkSnapshot(self) -> None:
+        self.snapshotThreads = [
+            thread for thread in self.snapshotThreads if thread.is_alive()
+        ]
+
+        if (
+            self.model
+            and not self.snapshotThreads
+            and (
+                self.records >= self.snapshotRecords or self.bytes >= self.snapshotBytes
+            )
+        ):
+            self._rotate(self.model.document, False)
+
+    def _rotate(self, document: Document, reset: bool) -> None:
+        if self.file:
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+        self.generation += 1
+        self.file = open(self._path("journal", self.generation), "wb")
+        self.file.write(bytes([RESET if reset else 0]))
+        self.file.flush()
+        self.records = 0
+        self.bytes = 0
+
+        if isinstance(document, MappedDocument) and document.isPristine():
+            self._writeSource(document, self.generation)
+            return
+
+        thread = Thread(
+            target=self._writeSnapshot,
+            args=(document.snapshot(), self.generation),
+            daemon=True,
+        )
+        self.snapshotThreads.append(thread)
+        thread.start()
+
+    def _writeSnapshot(self, snapshot: Document, generation: int) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.directory)
+
+        try:
+            with open(fd, "w", encoding="utf-8", newline="\n") as file:
+                lines = snapshot.allLines()
+                row = 0
+
+                while row < snapshot.lineCount():
+                    chunk = list(islice(lines, SNAPSHOT_CHUNK_LINES))
+                    if row:
+                        file.write("\n")
+                    file.write("\n".join(chunk))
+                    row += len(chunk)
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temp_path, self._path("snapshot", generation))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self._removeBefore(generation)
+
+    def _writeSource(self, document: MappedDocument, generation: int) -> None:
+        assert document.path is not None
+        path = os.path.abspath(document.path)
+        stat = os.stat(path)
+        source = {"path": path, "stamp": [stat.st_size, stat.st_mtime_ns]}
+
+        fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.directory)
+        try:
+            with open(fd, "w", encoding="utf-8") as file:
+                json.dump(source, file)
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temp_path, self._path("source", generation))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self._removeBefore(generation)
+
+    def _removeBefore(self, generation: int) -> None:
+        for kind, generations in self._files().items():
+            for old in generations:
+                if old < generation:
+                    with suppress(OSError):
+                        os.unlink(self._path(kind, old))
@@ -0,0 +1,35 @@
+from __future__ import annotations
+from typing import BinaryIO
+import os
+import sys
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_NAME: str = "lock"
+
+
+class SessionLock:
+    def __init__(self, file: BinaryIO) -> None:
+        self.file: BinaryIO = file
+
+    @classmethod
+    def acquire(cls, directory: str) -> SessionLock | None:
+        file = open(os.path.join(directory, LOCK_NAME), "a+b")
+
+        try:
+            if sys.platform == "win32":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return None
+
+        return cls(file)
+
+    def release(self) -> None:
+        self.file.close()
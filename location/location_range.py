@@ -1,18 +1,14 @@
+from __future__ import annotations
+from typing import NamedTuple
 from location.location import Location
 
 
-class LocationRange:
-    def __init__(
-        self, start: Location = Location(), end: Location = Location()
-    ) -> None:
-        self.start: Location = start
-        self.end: Location = end
+class LocationRange(NamedTuple):
+    start: Location = Location()
+    end: Location = Location()
 
     def getCoords(self) -> tuple[int, int, int, int]:
-        start_coords = self.start.getCoords()
-        end_coords = self.end.getCoords()
+        if self.start > self.end:
+            return self.end + self.start
 
-        if start_coords > end_coords:
-            start_coords, end_coords = end_coords, start_coords
-
-        return start_coords + end_coords
+        return self.start + self.end
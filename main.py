@@ -1,4 +1,5 @@
-from tkinter import Tk
+import os
+from tkinter import Tk, messagebox
 from text.text_editor import TextEditor
 from menu.menu_bar import MenuBar
 from toolbar.toolbar import Toolbar
@@ -6,16 +7,28 @@ from statusbar.statusbar import Statusbar
 from text.text_editor_model import TextEditorModel
 from clipboard.clipboard_stack import ClipboardStack
 from undo.undo_manager import UndoManager
+from journal.journal import Journal
 from plugin import loadPlugins
 
+JOURNAL_DIR: str = os.path.join(os.path.expanduser("~"), ".text_editor", "journal")
+
 
 def main() -> None:
     window = Tk()
     tem = TextEditorModel(
         "The sky was painted with soft gold,\nWaves whispered secrets to the shore,\nLeaves danced under the autumn wind,\nSilent streets bathed in silver light,\nOld clocks ticked in sleepy rhythm,\nLanterns swung in the cooling breeze,\nForgotten songs hummed by the river,\nThe city breathed under velvet skies,\nFootsteps faded into the misty dark,\nDreams gathered on the edge of dawn."
     )
+    journal = Journal(JOURNAL_DIR)
+    recovered = journal.recover()
+    if recovered and messagebox.askyesno(
+        "Recover", "The editor did not shut down cleanly. Recover unsaved text?"
+    ):
+        tem.setDocument(recovered)
+    journal.attach(tem)
+
     cs = ClipboardStack()
     um = UndoManager.getInstance()
+    um.setModel(tem)
     mb = MenuBar(window)
     tb = Toolbar(window)
     sb = Statusbar(window)
@@ -27,6 +40,8 @@ def main() -> None:
 
     window.mainloop()
 
+    journal.close()
+
 
 if __name__ == "__main__":
     main()
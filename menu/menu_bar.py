@@ -13,12 +13,14 @@ class MenuBar(Menu):
         self.fileMenu: Menu = Menu(self, tearoff=0)
         self.fileMenu.add_command(label="Open")
         self.fileMenu.add_command(label="Save")
+        self.fileMenu.add_command(label="Cancel loading", state="disabled")
         self.fileMenu.add_command(label="Exit")
         self.add_cascade(label="File", menu=self.fileMenu)
 
         self.editMenu: Menu = Menu(self, tearoff=0)
         self.editMenu.add_command(label="Undo")
         self.editMenu.add_command(label="Redo")
+        self.editMenu.add_command(label="Revert to...")
         self.editMenu.add_separator()
         self.editMenu.add_command(label="Cut")
         self.editMenu.add_command(label="Copy")
@@ -30,19 +32,36 @@ class MenuBar(Menu):
         )
         self.add_cascade(label="Edit", menu=self.editMenu)
 
+        self.searchMenu: Menu = Menu(self, tearoff=0)
+        self.searchMenu.add_command(label="Find...")
+        self.searchMenu.add_command(label="Find regex...")
+        self.searchMenu.add_command(label="Find next")
+        self.searchMenu.add_command(label="Find previous")
+        self.searchMenu.add_separator()
+        self.searchMenu.add_command(label="Replace all...")
+        self.searchMenu.add_separator()
+        self.searchMenu.add_command(label="Enable search index")
+        self.searchMenu.add_command(label="Disable search index", state="disabled")
+        self.searchMenu.add_command(label="Search index statistics", state="disabled")
+        self.add_cascade(label="Search", menu=self.searchMenu)
+
         self.moveMenu: Menu = Menu(self, tearoff=0)
         self.moveMenu.add_command(label="Cursor to document start")
         self.moveMenu.add_command(label="Cursor to document end")
         self.add_cascade(label="Move", menu=self.moveMenu)
 
         self.pluginsMenu: Menu = Menu(self, tearoff=0)
+        self.pluginsMenu.add_command(label="Cancel plugin", state="disabled")
+        self.pluginsMenu.add_separator()
         self.add_cascade(label="Plugins", menu=self.pluginsMenu)
 
     def setCommand(self, menu: str, label: str, command: Callable[[], None]) -> None:
         menu_obj = {
             "File": self.fileMenu,
             "Edit": self.editMenu,
+            "Search": self.searchMenu,
             "Move": self.moveMenu,
+            "Plugins": self.pluginsMenu,
         }[menu]
 
         index = menu_obj.index(label)
@@ -55,7 +74,9 @@ class MenuBar(Menu):
         menu_obj = {
             "File": self.fileMenu,
             "Edit": self.editMenu,
+            "Search": self.searchMenu,
             "Move": self.moveMenu,
+            "Plugins": self.pluginsMenu,
         }[menu]
 
         index = menu_obj.index(label)
@@ -68,7 +89,9 @@ class MenuBar(Menu):
         menu_obj = {
             "File": self.fileMenu,
             "Edit": self.editMenu,
+            "Search": self.searchMenu,
             "Move": self.moveMenu,
+            "Plugins": self.pluginsMenu,
         }[menu]
 
         index = menu_obj.index(label)
@@ -1,51 +1,85 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from plugin import Plugin
-from action.compound_action import CompoundAction
+import re
+from background_plugin import BackgroundPlugin
 
-if TYPE_CHECKING:
-    from text.text_editor_model import TextEditorModel
-    from undo.undo_manager import UndoManager
-    from clipboard.clipboard_stack import ClipboardStack
+TITLE_CHARS: int = 0x0530
 
 
-class Capitalize(Plugin):
-    def getName(self) -> str:
-        return "Capitalize"
+def isTitleSafe(char: str) -> bool:
+    if char.isalpha():
+        return (
+            (char.isupper() or char.islower())
+            and char.title() == char.upper()
+            and len(char.upper()) == len(char.lower()) == 1
+        )
+
+    return char.title() == char.lower() == char and not char.isupper()
 
-    def getDescription(self) -> str:
-        return "Plugin that capitalizes all words in document."
 
-    def execute(
-        self,
-        model: TextEditorModel,
-        undoManager: UndoManager,
-        clipboardStack: ClipboardStack,
-    ) -> None:
-        lines = model.getLines()
-        capitalized_text = "\n".join([self.capitalizeLine(line) for line in lines])
+def capitalizeWords(line: str) -> str:
+    capitalizeNext = True
+    result = []
 
-        delete_action = model.clear()
-        insert_action = model.insert(capitalized_text)
+    for char in line:
+        if capitalizeNext and char.isalpha():
+            result.append(char.upper())
+            capitalizeNext = False
 
-        if delete_action and insert_action:
-            undoManager.push(CompoundAction([delete_action, insert_action]))
         else:
-            undoManager.push(insert_action)
+            result.append(char)
+
+        if not char.isalpha():
+            capitalizeNext = True
+
+    return "".join(result)
+
+
+SAFE_CHARS = "".join(
+    re.escape(chr(code)) for code in range(TITLE_CHARS) if isTitleSafe(chr(code))
+)
+LETTERS = "".join(
+    re.escape(chr(code)) for code in range(TITLE_CHARS) if chr(code).isalpha()
+)
+UPPERCASE = "".join(
+    re.escape(chr(code))
+    for code in range(TITLE_CHARS)
+    if isTitleSafe(chr(code)) and chr(code).lower() != chr(code)
+)
+
+# str.title() uppercases the first letter of every word and lowercases the rest.
+# When every letter on the line is a cased character whose titlecase is its
+# uppercase, that matches capitalizeWords except for uppercase letters inside a
+# word, which are copied back from the original line.
+UNSAFE_CHAR = re.compile(f"[^{SAFE_CHARS}]")
+INNER_UPPERCASE = re.compile(
+    f"[{UPPERCASE}](?<=[{LETTERS}][{UPPERCASE}])[{UPPERCASE}]*"
+)
+
+
+class Capitalize(BackgroundPlugin):
+    def getName(self) -> str:
+        return "Capitalize"
+
+    def getDescription(self) -> str:
+        return "Plugin that capitalizes all words in document."
 
-    def capitalizeLine(self, line: str) -> str:
-        capitalizeNext = True
-        result = []
+    def transformLine(self, line: str) -> str:
+        if not line.isascii() and UNSAFE_CHAR.search(line):
+            return capitalizeWords(line)
 
-        for char in line:
-            if capitalizeNext and char.isalpha():
-                result.append(char.upper())
-                capitalizeNext = False
+        title = line.title()
+        match = INNER_UPPERCASE.search(line)
+        if match is None:
+            return title
 
-            else:
-                result.append(char)
+        parts = []
+        end = 0
 
-            if not char.isalpha():
-                capitalizeNext = True
+        while match:
+            parts.append(title[end : match.start()])
+            parts.append(match.group())
+            end = match.end()
+            match = INNER_UPPERCASE.search(line, end)
 
-        return "".join(result)
+        parts.append(title[end:])
+        return "".join(parts)
@@ -22,14 +22,10 @@ class Statistics(Plugin):
         undoManager: UndoManager,
         clipboardStack: ClipboardStack,
     ) -> None:
-        lines = model.getLines()
-        words = [word for line in lines for word in line.split()]
-        chars = [char for line in lines for char in line if not char.isspace()]
-
         message = (
-            f"Lines: {len(lines)}\n"
-            f"Words: {len(words)}\n"
-            f"Characters: {len(chars)}"
+            f"Lines: {model.lineCount()}\n"
+            f"Words: {model.wordCount()}\n"
+            f"Characters: {model.charCount()}"
         )
 
         messagebox.showinfo("Document Statistics", message)
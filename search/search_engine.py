@@ -0,0 +1,206 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from bisect import bisect_left
+import re
+from text.edit_observer import EditObserver
+from location.location import Location
+from location.location_range import LocationRange
+from document.document import REBUILD_RATIO
+from search.trigram_index import TrigramIndex, patternTrigrams
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from document.document import Document, LineDiff
+    from text.text_editor_model import TextEditorModel
+
+SEARCH_CHUNK_ROWS: int = 2048
+
+
+class SearchEngine(EditObserver):
+    def __init__(self, model: TextEditorModel) -> None:
+        self.model: TextEditorModel = model
+        self.pattern: re.Pattern[str] | None = None
+        self.regex: bool = False
+        self.trigrams: set[str] = set()
+        self.index: TrigramIndex | None = None
+        self.scanned: bytearray = bytearray()
+        self.matchRows: list[int] = []
+        self.matchSpans: list[list[tuple[int, int]]] = []
+        self.generation: int = 0
+
+        model.addEditObserver(self)
+
+    def setPattern(self, text: str, regex: bool = False) -> None:
+        self.pattern = re.compile(text if regex else re.escape(text))
+        self.regex = regex
+        self.trigrams = patternTrigrams(text, regex)
+        self._reset()
+
+    def enableIndex(self) -> None:
+        if self.index is None:
+            self.index = TrigramIndex(self.model.document)
+            self.model.addEditObserver(self.index)
+
+    def disableIndex(self) -> None:
+        if self.index is not None:
+            self.model.removeEditObserver(self.index)
+            self.index = None
+
+    def _reset(self) -> None:
+        self.scanned = bytearray(self.model.lineCount())
+        self.matchRows = []
+        self.matchSpans = []
+        self.generation += 1
+
+    def _scanRows(self, start: int, stop: int) -> None:
+        assert self.pattern is not None
+
+        index = bisect_left(self.matchRows, start)
+
+        for row, line in enumerate(self.model.linesRange(start, stop), start):
+            if self.scanned[row]:
+                continue
+
+            self.scanned[row] = 1
+            spans = [
+                match.span()
+                for match in self.pattern.finditer(line)
+                if match.end() > match.start()
+            ]
+
+            if spans:
+                index = bisect_left(self.matchRows, row, index)
+                self.matchRows.insert(index, row)
+                self.matchSpans.insert(index, spans)
+
+    def search(
+        self, location: Location, forward: bool
+    ) -> Iterator[LocationRange | None]:
+        if self.pattern is None:
+            return
+
+        if self.index is not None and self.trigrams:
+            for start, stop in self.index.excluded(self.trigrams):
+                self.scanned[start:stop] = bytes([1]) * (stop - start)
+
+        row, col = location
+        if forward:
+            yield from self._searchForward(row, col)
+        else:
+            yield from self._searchBackward(row, col)
+
+    def _match(self, row: int, span: tuple[int, int]) -> LocationRange:
+        return LocationRange(Location(row, span[0]), Location(row, span[1]))
+
+    def _searchForward(self, row: int, col: int) -> Iterator[LocationRange | None]:
+        for start, stop, limit in ((row, len(self.scanned), col), (0, row + 1, None)):
+            current = start
+
+            while current < stop:
+                unscanned = self.scanned.find(0, current, stop)
+                scannedEnd = stop if unscanned < 0 else unscanned
+
+                index = bisect_left(self.matchRows, current)
+                while (
+                    index < len(self.matchRows) and self.matchRows[index] < scannedEnd
+                ):
+                    matchRow = self.matchRows[index]
+                    for span in self.matchSpans[index]:
+                        if limit is None or matchRow != row or span[0] >= limit:
+                            yield self._match(matchRow, span)
+                            return
+                    index += 1
+
+                if scannedEnd == stop:
+                    break
+
+                current = scannedEnd
+                self._scanRows(current, min(current + SEARCH_CHUNK_ROWS, stop))
+                yield None
+
+    def _searchBackward(self, row: int, col: int) -> Iterator[LocationRange | None]:
+        for start, stop, limit in ((0, row + 1, col), (row, len(self.scanned), None)):
+            current = stop
+
+            while current > start:
+                unscanned = self.scanned.rfind(0, start, current)
+                scannedStart = start if unscanned < 0 else unscanned + 1
+
+                index = bisect_left(self.matchRows, current) - 1
+                while index >= 0 and self.matchRows[index] >= scannedStart:
+                    matchRow = self.matchRows[index]
+                    for span in reversed(self.matchSpans[index]):
+                        if limit is None or matchRow != row or span[0] < limit:
+                            yield self._match(matchRow, span)
+                            return
+                    index -= 1
+
+                if scannedStart == start:
+                    break
+
+                current = scannedStart
+                self._scanRows(max(current - SEARCH_CHUNK_ROWS, start), current)
+                yield None
+
+    def _invalidate(self, start: int, oldEnd: int, newEnd: int) -> None:
+        if self.pattern is None:
+            return
+
+        self.scanned[start:oldEnd] = bytes(newEnd - start)
+
+        first = bisect_left(self.matchRows, start)
+        last = bisect_left(self.matchRows, oldEnd, first)
+        del self.matchRows[first:last]
+        del self.matchSpans[first:last]
+
+        delta = newEnd - oldEnd
+        if delta:
+            self.matchRows[first:] = [row + delta for row in self.matchRows[first:]]
+
+        self.generation += 1
+
+    def insertText(self, row: int, col: int, text: str) -> None:
+        self._invalidate(row, row + 1, row + text.count("\n") + 1)
+
+    def deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> None:
+        self._invalidate(s_row, e_row + 1, s_row + 1)
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        if self.pattern is None:
+            return
+
+        if len(diffs) * REBUILD_RATIO >= len(self.scanned):
+            self._reset()
+            return
+
+        scanned = bytearray()
+        matchRows: list[int] = []
+        matchSpans: list[list[tuple[int, int]]] = []
+        position = index = shift = 0
+
+        for row, col, removed, inserted in diffs:
+            e_row = row + removed.count("\n")
+            newlines = inserted.count("\n")
+
+            stop = bisect_left(self.matchRows, row, index)
+            matchRows.extend(r + shift for r in self.matchRows[index:stop])
+            matchSpans.extend(self.matchSpans[index:stop])
+            index = bisect_left(self.matchRows, e_row + 1, stop)
+
+            scanned += self.scanned[position:row]
+            scanned += bytes(newlines + 1)
+            position = e_row + 1
+            shift += newlines - (e_row - row)
+
+        matchRows.extend(r + shift for r in self.matchRows[index:])
+        matchSpans.extend(self.matchSpans[index:])
+        scanned += self.scanned[position:]
+
+        self.scanned = scanned
+        self.matchRows = matchRows
+        self.matchSpans = matchSpans
+        self.generation += 1
+
+    def resetText(self, document: Document) -> None:
+        if self.pattern is not None:
+            self._reset()
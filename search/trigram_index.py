@@ -0,0 +1,239 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from bisect import bisect_right
+from itertools import accumulate
+import re
+import sys
+from text.edit_observer import EditObserver
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from document.document import Document, LineDiff
+
+BLOCK_LINES: int = 128
+BLOOM_BITS: int = 1 << 14
+MIN_BLOOM_BITS: int = 64
+BLOOM_DENSITY: int = 4
+BIT_DIGITS: bytes = bytes.maketrans(b"\x00\x01", b"01")
+
+GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+ESCAPE_DIGITS: dict[str, int] = {"x": 2, "u": 4, "U": 8}
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def bloomOf(grams: Iterable[str], bits: int) -> int:
+    flags = bytearray(bits)
+    mask = bits - 1
+
+    for gram in grams:
+        flags[hash(gram) & mask] = 1
+
+    return int(flags.translate(BIT_DIGITS), 2)
+
+
+def blockBloom(text: str) -> int:
+    grams = trigrams(text.casefold())
+    bits = MIN_BLOOM_BITS
+
+    while bits < BLOOM_BITS and bits < BLOOM_DENSITY * len(grams):
+        bits <<= 1
+
+    return 1 << bits | bloomOf(grams, bits)
+
+
+def regexLiterals(pattern: str) -> list[str]:
+    flags = GLOBAL_FLAGS.match(pattern)
+    if "|" in pattern or (flags and "x" in flags.group(1)):
+        return []
+
+    literals: list[str] = []
+    run: list[str] = []
+    depth = 0
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+
+        if char == "\\":
+            escaped = pattern[i : i + 1]
+            i += 1
+
+            if escaped and not escaped.isalnum():
+                if not depth:
+                    run.append(escaped)
+                continue
+
+            if escaped in ESCAPE_DIGITS:
+                i += ESCAPE_DIGITS[escaped]
+            elif escaped == "N":
+                i = pattern.find("}", i) + 1 or len(pattern)
+            elif escaped.isdigit():
+                while i < len(pattern) and pattern[i].isdigit():
+                    i += 1
+
+        elif char == "[":
+            if pattern[i : i + 1] == "^":
+                i += 1
+            if pattern[i : i + 1] == "]":
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+
+        elif char in "*?+{":
+            if run:
+                run.pop()
+            if char == "{":
+                close = pattern.find("}", i)
+                i = len(pattern) if close < 0 else close + 1
+
+        elif char == "(":
+            depth += 1
+
+        elif char == ")":
+            depth -= 1
+
+        elif char not in ".^$":
+            if not depth:
+                run.append(char)
+            continue
+
+        literals.append("".join(run))
+        run = []
+
+    literals.append("".join(run))
+    return [literal for literal in literals if len(literal) >= 3]
+
+
+def patternTrigrams(text: str, regex: bool) -> set[str]:
+    literals = regexLiterals(text) if regex else [text]
+    return set().union(*(trigrams(literal.casefold()) for literal in literals))
+
+
+class TrigramIndex(EditObserver):
+    def __init__(self, document: Document) -> None:
+        self.document: Document = document
+        self.counts: list[int] = []
+        self.blooms: list[int | None] = []
+        self.starts: list[int] | None = None
+        self.version: int = 0
+
+        self._reset()
+
+    def _reset(self) -> None:
+        self.counts = self._chunk(self.document.lineCount())
+        self.blooms = [None] * len(self.counts)
+        self.starts = None
+        self.version += 1
+
+    @staticmethod
+    def _chunk(count: int) -> list[int]:
+        if count <= 2 * BLOCK_LINES:
+            return [count]
+
+        full, rest = divmod(count, BLOCK_LINES)
+        return [BLOCK_LINES] * full + ([rest] if rest else [])
+
+    def _starts(self) -> list[int]:
+        if self.starts is None:
+            self.starts = list(accumulate(self.counts, initial=0))
+
+        return self.starts
+
+    def _locate(self, row: int) -> int:
+        return min(bisect_right(self._starts(), row), len(self.counts)) - 1
+
+    def build(self) -> Iterator[None]:
+        version = self.version
+        block = 0
+
+        while True:
+            if version != self.version:
+                version = self.version
+                block = 0
+
+            try:
+                block = self.blooms.index(None, block)
+            except ValueError:
+                return
+
+            starts = self._starts()
+            lines = self.document.linesRange(starts[block], starts[block + 1])
+            self.blooms[block] = blockBloom("\n".join(lines))
+
+            yield None
+
+    def excluded(self, grams: set[str]) -> Iterator[tuple[int, int]]:
+        starts = self._starts()
+        masks: dict[int, int] = {}
+
+        for block, bloom in enumerate(self.blooms):
+            if bloom is None:
+                continue
+
+            bits = bloom.bit_length() - 1
+            mask = masks.get(bits)
+            if mask is None:
+                mask = masks[bits] = bloomOf(grams, bits)
+
+            if bloom & mask != mask:
+                yield starts[block], starts[block + 1]
+
+    def indexedBlocks(self) -> int:
+        return len(self.blooms) - self.blooms.count(None)
+
+    def progress(self) -> float:
+        return self.indexedBlocks() / len(self.blooms)
+
+    def memoryUsage(self) -> int:
+        size = sys.getsizeof(self.counts) + sys.getsizeof(self.blooms)
+        if self.starts is not None:
+            size += sys.getsizeof(self.starts)
+
+        return size + sum(
+            sys.getsizeof(bloom) for bloom in self.blooms if bloom is not None
+        )
+
+    def _replaceRows(self, start: int, oldStop: int, newStop: int) -> None:
+        starts = self._starts()
+        first = self._locate(start)
+        last = self._locate(oldStop - 1)
+
+        chunks = self._chunk(starts[last + 1] - starts[first] + newStop - oldStop)
+        self.counts[first : last + 1] = chunks
+        self.blooms[first : last + 1] = [None] * len(chunks)
+
+        if newStop != oldStop or len(chunks) != last - first + 1:
+            self.starts = None
+
+        self.version += 1
+
+    def insertText(self, row: int, col: int, text: str) -> None:
+        self._replaceRows(row, row + 1, row + text.count("\n") + 1)
+
+    def deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> None:
+        self._replaceRows(s_row, e_row + 1, s_row + 1)
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        starts = self._starts()
+        block = 0
+
+        for row, col, removed, inserted in diffs:
+            if "\n" in removed or "\n" in inserted:
+                self._reset()
+                return
+
+            while starts[block + 1] <= row:
+                block += 1
+
+            self.blooms[block] = None
+
+        self.version += 1
+
+    def resetText(self, document: Document) -> None:
+        self.document = document
+        self._reset()
@@ -14,8 +14,20 @@ class Statusbar(Frame):
         self.linesLabel: Label = Label(self)
         self.linesLabel.pack(side="right", fill="x")
 
+        self.statisticsLabel: Label = Label(self)
+        self.statisticsLabel.pack(side="right", fill="x")
+
+        self.progressLabel: Label = Label(self)
+        self.progressLabel.pack(side="left", fill="x")
+
     def setCursorLabel(self, row: str, col: str) -> None:
         self.cursorLabel.config(text=f"Cursor Location:[{row}:{col}]")
 
     def setLinesLabel(self, currLine: str, allLines: str) -> None:
         self.linesLabel.config(text=f"Lines:[{currLine}/{allLines}]")
+
+    def setStatisticsLabel(self, words: str, chars: str) -> None:
+        self.statisticsLabel.config(text=f"Words:[{words}] Characters:[{chars}]")
+
+    def setProgressLabel(self, text: str) -> None:
+        self.progressLabel.config(text=text)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+from queue import Empty, Queue
+from threading import Event, Thread
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from tkinter import Misc
+
+POLL_INTERVAL: int = 50
+
+
+class BackgroundTask:
+    def __init__(
+        self,
+        widget: Misc,
+        work: Callable[[BackgroundTask], None],
+        onMessages: Callable[[list[Any]], None],
+        onDone: Callable[[BaseException | None], None],
+    ) -> None:
+        self.widget: Misc = widget
+        self.work: Callable[[BackgroundTask], None] = work
+        self.onMessages: Callable[[list[Any]], None] = onMessages
+        self.onDone: Callable[[BaseException | None], None] = onDone
+
+        self.messages: Queue[Any] = Queue()
+        self.cancelled: Event = Event()
+        self.error: BaseException | None = None
+        self.thread: Thread = Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+        self.widget.after(0, self._poll)
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def isCancelled(self) -> bool:
+        return self.cancelled.is_set()
+
+    def post(self, message: Any) -> None:
+        self.messages.put(message)
+
+    def _run(self) -> None:
+        try:
+            self.work(self)
+        except BaseException as e:
+            self.error = e
+
+    def _poll(self) -> None:
+        finished = not self.thread.is_alive()
+        messages = []
+
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except Empty:
+                break
+
+        if messages and not self.isCancelled():
+            self.onMessages(messages)
+
+        if finished:
+            self.onDone(self.error)
+        else:
+            self.widget.after(POLL_INTERVAL, self._poll)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+from document.document import textEnd
+
+if TYPE_CHECKING:
+    from document.document import Document, LineDiff
+
+
+class EditObserver(ABC):
+    @abstractmethod
+    def insertText(self, row: int, col: int, text: str) -> None:
+        pass
+
+    @abstractmethod
+    def deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> None:
+        pass
+
+    @abstractmethod
+    def resetText(self, document: Document) -> None:
+        pass
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        for row, col, removed, inserted in reversed(diffs):
+            self.deleteText(row, col, *textEnd(row, col, removed))
+            self.insertText(row, col, inserted)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from array import array
+from os.path import commonprefix
+from tkinter.font import Font
+
+if TYPE_CHECKING:
+    from tkinter import Misc
+    from text.text_change import TextChange
+
+
+class FontMetrics:
+    def __init__(self, root: Misc, font: tuple[str, int]) -> None:
+        self.font: Font = Font(root=root, font=font)
+        self.lineHeight: int = self.font.metrics("linespace")
+        self.glyphWidths: dict[str, int] = {}
+        self.rowWidths: dict[int, tuple[str, array[int]]] = {}
+
+    def glyphWidth(self, char: str) -> int:
+        width = self.glyphWidths.get(char)
+
+        if width is None:
+            width = self.font.measure(char)
+            self.glyphWidths[char] = width
+
+        return width
+
+    def prefixWidths(self, row: int, line: str) -> array[int]:
+        cached = self.rowWidths.get(row)
+
+        if cached is None:
+            keep = 0
+            widths = array("l", [0])
+        else:
+            cached_line, widths = cached
+            if cached_line == line:
+                return widths
+
+            keep = len(commonprefix([cached_line, line]))
+            widths = widths[: keep + 1]
+
+        total = widths[-1]
+        for char in line[keep:]:
+            total += self.glyphWidth(char)
+            widths.append(total)
+
+        self.rowWidths[row] = (line, widths)
+
+        return widths
+
+    def textWidth(self, row: int, line: str, col: int) -> int:
+        return self.prefixWidths(row, line)[col]
+
+    def updateRows(self, change: TextChange) -> None:
+        start, old_end, new_end = change.getRows()
+        delta = change.getDelta()
+
+        self.rowWidths = {
+            row + delta if row >= old_end else row: widths
+            for row, widths in self.rowWidths.items()
+            if not min(old_end, new_end) <= row < old_end
+        }
+
+    def retainRows(self, first: int, last: int) -> None:
+        for row in [r for r in self.rowWidths if not first <= r < last]:
+            del self.rowWidths[row]
@@ -0,0 +1,217 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain, islice
+from text.edit_observer import EditObserver
+from location.location import Location
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from document.document import Document, LineDiff
+
+BLOCK_SIZE: int = 512
+
+
+class OffsetIndex(EditObserver):
+    def __init__(self, document: Document) -> None:
+        self.document: Document = document
+        self.blocks: list[array[int]] | None = None
+        self.blockCounts: list[int] = []
+        self.blockLengths: list[int] = []
+        self.countTree: list[int] = []
+        self.lengthTree: list[int] = []
+        self.blockPrefixes: dict[int, list[int]] = {}
+
+    def _build(self) -> None:
+        lengths = (len(line) + 1 for line in self.document.allLines())
+        blocks = []
+
+        while chunk := array("I", islice(lengths, BLOCK_SIZE)):
+            blocks.append(chunk)
+
+        self._setBlocks(blocks or [array("I", [1])])
+
+    def _setBlocks(self, blocks: list[array[int]]) -> None:
+        self.blocks = blocks
+        self.blockCounts = [len(block) for block in blocks]
+        self.blockLengths = [sum(block) for block in blocks]
+        self.countTree = self._tree(self.blockCounts)
+        self.lengthTree = self._tree(self.blockLengths)
+        self.blockPrefixes = {}
+
+    @staticmethod
+    def _tree(values: list[int]) -> list[int]:
+        tree = [0, *values]
+
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+
+        return tree
+
+    @staticmethod
+    def _add(tree: list[int], block: int, delta: int) -> None:
+        index = block + 1
+
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    @staticmethod
+    def _prefix(tree: list[int], block: int) -> int:
+        total = 0
+
+        while block:
+            total += tree[block]
+            block -= block & -block
+
+        return total
+
+    @staticmethod
+    def _search(tree: list[int], value: int) -> tuple[int, int]:
+        block = 0
+        step = 1 << (len(tree) - 1).bit_length()
+
+        while step:
+            index = block + step
+            if index < len(tree) and tree[index] <= value:
+                block = index
+                value -= tree[index]
+            step >>= 1
+
+        return block, value
+
+    def _blockPrefix(self, block: int) -> list[int]:
+        prefix = self.blockPrefixes.get(block)
+
+        if prefix is None:
+            assert self.blocks is not None
+            prefix = self.blockPrefixes[block] = list(accumulate(self.blocks[block]))
+
+        return prefix
+
+    def _locateRow(self, row: int) -> tuple[int, int]:
+        block, index = self._search(self.countTree, row)
+        return min(block, len(self.blockCounts) - 1), index
+
+    def length(self) -> int:
+        if self.blocks is None:
+            self._build()
+
+        return self._prefix(self.lengthTree, len(self.blockLengths)) - 1
+
+    def offsetOf(self, location: Location) -> int:
+        if self.blocks is None:
+            self._build()
+
+        row, col = location
+        block, index = self._locateRow(row)
+        offset = self._prefix(self.lengthTree, block)
+
+        if index:
+            offset += self._blockPrefix(block)[index - 1]
+
+        return offset + col
+
+    def locationAt(self, offset: int) -> Location:
+        offset = max(0, min(offset, self.length()))
+
+        block, remainder = self._search(self.lengthTree, offset)
+        prefix = self._blockPrefix(block)
+        index = bisect_right(prefix, remainder)
+
+        row = self._prefix(self.countTree, block) + index
+        col = remainder - (prefix[index - 1] if index else 0)
+
+        return Location(row, col)
+
+    def _lineLengths(self, start: int, stop: int) -> list[int]:
+        return [self.document.lineLength(row) + 1 for row in range(start, stop)]
+
+    def _replace(self, start: int, stop: int, lengths: Iterable[int]) -> None:
+        blocks = self.blocks
+        if blocks is None:
+            return
+
+        first, i = self._locateRow(start)
+        last, j = self._locateRow(stop - 1)
+        j += 1
+
+        if first == last:
+            block = blocks[first]
+            lengths = array("I", lengths)
+            delta = sum(lengths) - sum(block[i:j])
+            block[i:j] = lengths
+
+            if 0 < len(block) <= 2 * BLOCK_SIZE:
+                self._add(self.countTree, first, len(block) - self.blockCounts[first])
+                self._add(self.lengthTree, first, delta)
+                self.blockCounts[first] = len(block)
+                self.blockLengths[first] += delta
+                self.blockPrefixes.pop(first, None)
+                return
+
+            rows = block
+        else:
+            rows = array("I", chain(blocks[first][:i], lengths, blocks[last][j:]))
+
+        chunks = [
+            rows[index : index + BLOCK_SIZE]
+            for index in range(0, len(rows), BLOCK_SIZE)
+        ]
+        blocks[first : last + 1] = chunks
+        self._setBlocks(blocks or [array("I", [1])])
+
+    def _resize(self, row: int, delta: int) -> None:
+        assert self.blocks is not None
+        block, index = self._locateRow(row)
+
+        self.blocks[block][index] += delta
+        self._add(self.lengthTree, block, delta)
+        self.blockLengths[block] += delta
+        self.blockPrefixes.pop(block, None)
+
+    def insertText(self, row: int, col: int, text: str) -> None:
+        if self.blocks is None:
+            return
+
+        lines = text.count("\n")
+        if lines:
+            self._replace(row, row + 1, self._lineLengths(row, row + lines + 1))
+        else:
+            self._resize(row, len(text))
+
+    def deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> None:
+        if self.blocks is None:
+            return
+
+        if s_row != e_row:
+            self._replace(s_row, e_row + 1, self._lineLengths(s_row, s_row + 1))
+        else:
+            self._resize(s_row, s_col - e_col)
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        blocks = self.blocks
+        if blocks is None:
+            return
+
+        block = first = 0
+
+        for row, col, removed, inserted in diffs:
+            if "\n" in removed or "\n" in inserted:
+                self.blocks = None
+                return
+
+            while row >= first + self.blockCounts[block]:
+                first += self.blockCounts[block]
+                block += 1
+
+            blocks[block][row - first] += len(inserted) - len(removed)
+
+        self._setBlocks(blocks)
+
+    def resetText(self, document: Document) -> None:
+        self.document = document
+        self.blocks = None
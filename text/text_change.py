@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+
+class TextChange:
+    def __init__(self, startRow: int, oldEndRow: int, newEndRow: int) -> None:
+        self.startRow: int = startRow
+        self.oldEndRow: int = oldEndRow
+        self.newEndRow: int = newEndRow
+
+    def getRows(self) -> tuple[int, int, int]:
+        return (self.startRow, self.oldEndRow, self.newEndRow)
+
+    def getDelta(self) -> int:
+        return self.newEndRow - self.oldEndRow
+
+    def merge(self, other: TextChange) -> TextChange:
+        startRow = min(self.startRow, other.startRow)
+        oldEndRow = max(self.oldEndRow, other.oldEndRow - self.getDelta())
+        newEndRow = oldEndRow + self.getDelta() + other.getDelta()
+
+        return TextChange(startRow, oldEndRow, newEndRow)
+
+    def __repr__(self) -> str:
+        return f"TextChange: {self.startRow}, {self.oldEndRow}, {self.newEndRow}"
@@ -1,14 +1,29 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from tkinter import Canvas, filedialog, messagebox
+from typing import TYPE_CHECKING, Any
+import os
+import re
+import shutil
+import tempfile
+from codecs import getincrementaldecoder
+from contextlib import suppress
+from io import IncrementalNewlineDecoder
+from itertools import islice
+from time import perf_counter
+from tkinter import Canvas, Scrollbar, filedialog, messagebox, simpledialog
 from cursor.cursor_observer import CursorObserver
 from text.text_observer import TextObserver
 from text.select_observer import SelectObserver
+from text.font_metrics import FontMetrics
 from location.location import Location
-from location.location_range import LocationRange
 from clipboard.clipboard_observer import ClipboardObserver
 from undo.undo_observer import UndoObserver
 from undo.redo_observer import RedoObserver
+from document.mapped_document import MappedDocument
+from task.background_task import BackgroundTask
+from undo.undo_history import UndoHistory
+from search.search_engine import SearchEngine
+from action.edit_action import actionFromRecord
+from background_plugin import BackgroundPlugin
 
 if TYPE_CHECKING:
     from text.text_editor_model import TextEditorModel
@@ -17,10 +32,23 @@ if TYPE_CHECKING:
     from menu.menu_bar import MenuBar
     from toolbar.toolbar import Toolbar
     from statusbar.statusbar import Statusbar
-    from tkinter import Tk
+    from tkinter import Event, Tk
     from plugin import Plugin
+    from text.text_change import TextChange
+    from document.document import Document, LineDiff
+    from action.edit_action import EditAction
+    from location.location_range import LocationRange
+    from collections.abc import Iterator
 
 SELECT_COLOR: str = "#257AFD"
+OVERSCAN: int = 10
+FONT: tuple[str, int] = ("Arial", 16)
+MAPPED_FILE_SIZE: int = 16 * 1024 * 1024
+LOAD_CHUNK_SIZE: int = 256 * 1024
+SAVE_CHUNK_LINES: int = 4096
+SEARCH_SLICE: float = 0.02
+INDEX_DELAY: int = 50
+HISTORY_DIR: str = os.path.join(os.path.expanduser("~"), ".text_editor", "history")
 
 
 class TextEditor(
@@ -67,7 +95,30 @@ class TextEditor(
         self.undoManager.addRedoObserver(self)
 
         self.cursor_id: int = 0
-        self.line_ids: list[int | list[int]] = []
+        self.fontMetrics: FontMetrics = FontMetrics(self, FONT)
+        self.line_ids: dict[int, int | list[int]] = {}
+        self.line_pool: list[int] = []
+        self.row_styles: dict[int, tuple[int, int | None]] = {}
+        self.first_row: int = 0
+        self.last_row: int = 0
+        self.scroll_height: int = 0
+        self.viewport_pending: bool = False
+        self.loadTask: BackgroundTask | None = None
+        self.load_started: bool = False
+        self.load_partial: bool = False
+        self.saveTask: BackgroundTask | None = None
+        self.pluginTask: BackgroundTask | None = None
+        self.undoHistory: UndoHistory = UndoHistory(HISTORY_DIR)
+        self.searchEngine: SearchEngine = SearchEngine(textEditorModel)
+        self.searchJob: Iterator[LocationRange | None] | None = None
+        self.searchForward: bool = True
+        self.searchGeneration: int = 0
+        self.indexJob: Iterator[None] | None = None
+        self.statisticsJob: Iterator[None] | None = None
+
+        self.scrollbar: Scrollbar = Scrollbar(master, command=self._scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.config(yscrollcommand=self.scrollbar.set, yscrollincrement=20)
 
         self._setBinds()
         self._setMenuCommands()
@@ -75,6 +126,7 @@ class TextEditor(
 
         self.drawText()
         self.updateCursorLocation(self.textEditorModel.getCursorLocation())
+        self._updateStatistics()
         self.textEditorModel.notifySelectObservers()
         self.clipboardStack.notifyClipboardObservers()
         self.undoManager.notifyUndoObservers()
@@ -85,114 +137,264 @@ class TextEditor(
         self.focus_set()
 
     def drawText(self) -> None:
+        for line_id in self.line_ids.values():
+            self._releaseLine(line_id)
+        self.line_ids = {}
+        self.row_styles = {}
+
+        self._updateViewport()
+
+    def _visibleRange(self) -> tuple[int, int]:
+        top = max(int(self.canvasy(0)) - 5, 0) // 20
+        rows = self.winfo_height() // 20 + 1
+
+        first = max(top - OVERSCAN, 0)
+        last = min(top + rows + OVERSCAN, self.textEditorModel.lineCount())
+
+        return first, last
+
+    def _updateViewport(self) -> None:
         tem = self.textEditorModel
+        self.viewport_pending = False
+        self.first_row, self.last_row = self._visibleRange()
 
-        for i in range(len(self.line_ids)):
-            self._deleteLine(i)
-        self.line_ids = []
+        for row in [
+            r for r in self.line_ids if not self.first_row <= r < self.last_row
+        ]:
+            self._releaseLine(self.line_ids.pop(row))
+            self.row_styles.pop(row, None)
 
-        for i, line in enumerate(tem.allLines()):
-            line_id = self.create_text(
-                5, 5 + i * 20, text=line, anchor="nw", font=("Arial", 16)
-            )
-            self.line_ids.append(line_id)
+        row = self.first_row
+        while row < self.last_row:
+            if row in self.line_ids:
+                row += 1
+                continue
 
-        sr = tem.getSelectionRange()
+            end = row
+            while end < self.last_row and end not in self.line_ids:
+                end += 1
 
-        if sr:
-            self._drawSelect(sr, tem)
+            for i, line in enumerate(tem.linesRange(row, end), row):
+                self.line_ids[i] = self._drawLine(line, i)
+
+            row = end
+
+        self.fontMetrics.retainRows(self.first_row, self.last_row)
+        self._updateScrollRegion()
+        self._drawSelect()
+
+    def _updateScrollRegion(self) -> None:
+        scroll_height = 10 + self.textEditorModel.lineCount() * 20
+
+        if scroll_height != self.scroll_height:
+            self.scroll_height = scroll_height
+            self.config(scrollregion=(0, 0, 0, scroll_height))
+
+    def _scheduleViewport(self) -> None:
+        if not self.viewport_pending:
+            self.viewport_pending = True
+            self.after_idle(self._updateViewport)
+
+    def _scroll(self, *args: str) -> None:
+        self.yview(*args)
+        self._updateViewport()
+
+    def _scrollWheel(self, units: int) -> None:
+        self.yview_scroll(units, "units")
+        self._updateViewport()
+
+    def _scrollMouseWheel(self, event: Event) -> None:
+        if not event.delta:
+            return
+
+        units = -1 if event.delta > 0 else 1
+        if self.tk.call("tk", "windowingsystem") == "win32":
+            units *= max(abs(event.delta) // 120, 1)
+
+        self._scrollWheel(units)
+
+    def _scrollToRow(self, row: int) -> None:
+        top = max(int(self.canvasy(0)) - 5, 0) // 20
+        rows = max(self.winfo_height() // 20 - 1, 1)
+
+        if row < top:
+            top = row
+        elif row >= top + rows:
+            top = row - rows + 1
+        else:
+            return
+
+        self._updateScrollRegion()
+        self.yview_moveto(top * 20 / max(self.scroll_height, 1))
+        self._scheduleViewport()
+
+    def _redrawRows(self, change: TextChange) -> None:
+        start, old_end, _ = change.getRows()
+        delta = change.getDelta()
+        line_ids: dict[int, int | list[int]] = {}
+
+        for row, line_id in self.line_ids.items():
+            if row < start:
+                line_ids[row] = line_id
+            elif row >= old_end:
+                if delta:
+                    self._moveLine(line_id, delta * 20)
+                line_ids[row + delta] = line_id
+            else:
+                self._releaseLine(line_id)
+
+        self.line_ids = line_ids
+        self.fontMetrics.updateRows(change)
+        self.row_styles = {
+            row + delta if row >= old_end else row: style
+            for row, style in self.row_styles.items()
+            if not start <= row < old_end
+        }
+
+        self._updateViewport()
+
+    def _selectStyles(self) -> dict[int, tuple[int, int | None]]:
+        sr = self.textEditorModel.getSelectionRange()
+        if not sr:
+            return {}
 
-    def _drawSelect(self, sr: LocationRange, tem: TextEditorModel) -> None:
         s_row, s_col, e_row, e_col = sr.getCoords()
+        styles: dict[int, tuple[int, int | None]] = {}
 
         if s_row == e_row:
-            line = tem.lines[s_row]
-            self._editLine(line, s_row, s_col, e_col)
-
+            styles[s_row] = (s_col, e_col)
         else:
-            line = tem.lines[s_row]
-            self._editLine(line, s_row, s_col, len(line))
+            for row in range(max(s_row + 1, self.first_row), min(e_row, self.last_row)):
+                styles[row] = (0, None)
+            styles[s_row] = (s_col, None)
+            styles[e_row] = (0, e_col)
+
+        return {row: style for row, style in styles.items() if row in self.line_ids}
+
+    def _drawSelect(self) -> None:
+        tem = self.textEditorModel
+        styles = self._selectStyles()
 
-            for i, line in enumerate(tem.linesRange(s_row + 1, e_row)):
-                self._editLine(line, s_row + 1 + i, 0, len(line))
+        for row in self.row_styles.keys() | styles.keys():
+            style = styles.get(row)
 
-            line = tem.lines[e_row]
-            self._editLine(line, e_row, 0, e_col)
+            if self.row_styles.get(row) != style:
+                self._releaseLine(self.line_ids[row])
+                line = tem.getLine(row)
 
-    def _editLine(self, line: str, row: int, s_col: int, e_col: int) -> None:
-        self._deleteLine(row)
-        self.line_ids.pop(row)
-        self._drawSelectLine(line, row, s_col, e_col)
+                if style is None:
+                    self.line_ids[row] = self._drawLine(line, row)
+                else:
+                    s_col, e_col = style
+                    self.line_ids[row] = self._drawSelectLine(
+                        line, row, s_col, len(line) if e_col is None else e_col
+                    )
 
-    def _deleteLine(self, index: int) -> None:
-        line_id = self.line_ids[index]
+        self.row_styles = styles
+
+    def _drawLine(self, line: str, row: int) -> int:
+        if self.line_pool:
+            line_id = self.line_pool.pop()
+            self.coords(line_id, 5, 5 + row * 20)
+            self.itemconfigure(line_id, text=line, state="normal")
+            return line_id
+
+        return self.create_text(5, 5 + row * 20, text=line, anchor="nw", font=FONT)
+
+    def _moveLine(self, line_id: int | list[int], dy: int) -> None:
+        if isinstance(line_id, list):
+            for id in line_id:
+                self.move(id, 0, dy)
+        else:
+            self.move(line_id, 0, dy)
+
+    def _releaseLine(self, line_id: int | list[int]) -> None:
         if isinstance(line_id, list):
             for id in line_id:
                 self.delete(id)
         else:
-            self.delete(line_id)
+            self.itemconfigure(line_id, state="hidden")
+            self.line_pool.append(line_id)
 
-    def _drawSelectLine(self, line: str, row: int, s_col: int, e_col: int) -> None:
-        before = line[:s_col]
-        selected = line[s_col:e_col]
-        after = line[e_col:]
+    def _drawSelectLine(self, line: str, row: int, s_col: int, e_col: int) -> list[int]:
+        widths = self.fontMetrics.prefixWidths(row, line)
         y = 5 + row * 20
-        new_ids = []
-
-        line_id = self.create_text(5, y, text=before, anchor="nw", font=("Arial", 16))
-        new_ids.append(line_id)
-
-        bbox = self.bbox(line_id)
-        x = bbox[2]
-
-        temp_id = self.create_text(
-            x, y, text=selected, anchor="nw", font=("Arial", 16), fill="white"
-        )
-        bbox = self.bbox(temp_id)
-        self.delete(temp_id)
+        s_x = 5 + widths[s_col]
+        e_x = 5 + widths[e_col]
+
+        return [
+            self.create_text(5, y, text=line[:s_col], anchor="nw", font=FONT),
+            self.create_rectangle(
+                s_x,
+                y,
+                e_x,
+                y + self.fontMetrics.lineHeight,
+                fill=SELECT_COLOR,
+                width=0,
+            ),
+            self.create_text(
+                s_x, y, text=line[s_col:e_col], anchor="nw", font=FONT, fill="white"
+            ),
+            self.create_text(e_x, y, text=line[e_col:], anchor="nw", font=FONT),
+        ]
 
-        rect_id = self.create_rectangle(bbox, fill=SELECT_COLOR, width=0)
-        new_ids.append(rect_id)
+    def updateCursorLocation(self, loc: Location) -> None:
+        line = self.textEditorModel.getLine(loc.row)
 
-        line_id = self.create_text(
-            x, y, text=selected, anchor="nw", font=("Arial", 16), fill="white"
-        )
-        new_ids.append(line_id)
+        cursor_x = 5 + self.fontMetrics.textWidth(loc.row, line, loc.col)
+        cursor_y = 5 + loc.row * 20
 
-        x = bbox[2]
+        self._scrollToRow(loc.row)
 
-        line_id = self.create_text(x, y, text=after, anchor="nw", font=("Arial", 16))
-        new_ids.append(line_id)
+        if self.cursor_id:
+            self.coords(self.cursor_id, cursor_x, cursor_y, cursor_x, cursor_y + 20)
+        else:
+            self.cursor_id = self.create_line(
+                cursor_x, cursor_y, cursor_x, cursor_y + 20, fill="black", width=2
+            )
 
-        self.line_ids.insert(row, new_ids)
+        self.statusbar.setCursorLabel(str(loc.row + 1), str(loc.col + 1))
+        lineCount = self.textEditorModel.lineCount()
+        self.statusbar.setLinesLabel(str(loc.row + 1), str(lineCount))
 
-    def updateCursorLocation(self, loc: Location) -> None:
-        if self.cursor_id:
-            self.delete(self.cursor_id)
+    def updateText(self, change: TextChange | None) -> None:
+        if change is not None:
+            self._redrawRows(change)
+            self._updateStatistics()
+        else:
+            self._drawSelect()
 
-        line = self.textEditorModel.lines[loc.row]
-        text_before_cursor = line[: loc.col]
+    def _updateStatistics(self) -> None:
+        if not self.textEditorModel.statistics.isReady():
+            self.statusbar.setStatisticsLabel("...", "...")
+            self._startStatistics()
+            return
 
-        temp_id = self.create_text(
-            5, 5, text=text_before_cursor, anchor="nw", font=("Arial", 16)
+        self.statusbar.setStatisticsLabel(
+            str(self.textEditorModel.wordCount()),
+            str(self.textEditorModel.charCount()),
         )
 
-        bbox = self.bbox(temp_id)
-        self.delete(temp_id)
+    def _startStatistics(self) -> None:
+        if self.statisticsJob is not None:
+            return
 
-        cursor_x = bbox[2]
-        cursor_y = 5 + loc.row * 20
+        job = self.textEditorModel.statistics.build()
+        self.statisticsJob = job
+        self.after(INDEX_DELAY, self._runStatistics, job)
 
-        self.cursor_id = self.create_line(
-            cursor_x, cursor_y, cursor_x, cursor_y + 20, fill="black", width=2
-        )
+    def _runStatistics(self, job: Iterator[None]) -> None:
+        if job is not self.statisticsJob:
+            return
 
-        self.statusbar.setCursorLabel(str(loc.row + 1), str(loc.col + 1))
-        lines = self.textEditorModel.getLines()
-        self.statusbar.setLinesLabel(str(loc.row + 1), str(len(lines)))
+        deadline = perf_counter() + SEARCH_SLICE
+        for _ in job:
+            if perf_counter() > deadline:
+                self.after(INDEX_DELAY, self._runStatistics, job)
+                return
 
-    def updateText(self) -> None:
-        self.drawText()
+        self.statisticsJob = None
+        self._updateStatistics()
 
     def updateClipboard(self, isEmpty: bool) -> None:
         if isEmpty:
@@ -254,6 +456,18 @@ class TextEditor(
         self.bind("<Shift-Up>", self.textEditorModel.selectUp)
         self.bind("<Shift-Down>", self.textEditorModel.selectDown)
 
+        for sequence in (
+            "<Left>",
+            "<Right>",
+            "<Up>",
+            "<Down>",
+            "<Shift-Left>",
+            "<Shift-Right>",
+            "<Shift-Up>",
+            "<Shift-Down>",
+        ):
+            self.bind(sequence, lambda event: self.undoManager.breakMerge(), add="+")
+
         self.bind(
             "<Control-c>",
             lambda event: self.textEditorModel.copy(event, self.clipboardStack),
@@ -282,46 +496,438 @@ class TextEditor(
             lambda event: self.undoManager.push(self.textEditorModel.keyPress(event)),
         )
 
+        self.bind("<Escape>", lambda event: self.cancelLoad())
+        self.bind("<Escape>", lambda event: self.cancelSearch(), add="+")
+        self.bind("<Control-f>", lambda event: self.find())
+        self.bind("<F3>", lambda event: self.findNext())
+        self.bind("<Shift-F3>", lambda event: self.findPrevious())
+
         self.bind("<Control-z>", self.undoManager.undo)
         self.bind("<Control-y>", self.undoManager.redo)
 
+        self.bind("<Configure>", lambda event: self._updateViewport())
+        self.bind("<MouseWheel>", self._scrollMouseWheel)
+        self.bind("<Button-4>", lambda event: self._scrollWheel(-3))
+        self.bind("<Button-5>", lambda event: self._scrollWheel(3))
+
     def openFile(self) -> None:
         file_path = filedialog.askopenfilename()
         if not file_path:
             return
 
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                self.undoManager.undoStack = []
-                self.undoManager.redoStack = []
-
-                self.undoManager.notifyUndoObservers()
-                self.undoManager.notifyRedoObservers()
-
-                content = file.read().splitlines()
-                self.textEditorModel.setLines(content)
+            if os.path.getsize(file_path) >= MAPPED_FILE_SIZE:
+                document = MappedDocument.fromFile(file_path)
+
+                if not document.loneReturns:
+                    self._abandonLoad()
+                    self.load_partial = False
+                    self.undoManager.clear()
+                    self.textEditorModel.setDocument(document)
+                    self.undoManager.setHistoryLoader(
+                        lambda: self._loadHistory(file_path, None)
+                    )
+                    return
 
         except Exception as e:
             messagebox.showerror("Error", f"Could not open file: {e}")
+            return
+
+        self._abandonLoad()
+        self.undoManager.clear()
+        self.textEditorModel.setLines([])
+        self.load_started = False
+        self.load_partial = False
+
+        digests: list[str] = []
+
+        task = BackgroundTask(
+            self,
+            lambda current: self._readFile(current, file_path, digests),
+            self._loadLines,
+            lambda error: self._loadDone(task, error, file_path, digests),
+        )
+        self.loadTask = task
+        self.menuBar.enableCommand("File", "Cancel loading")
+        self.menuBar.disableCommand("File", "Save")
+        self.statusbar.setProgressLabel("Loading 0%")
+        task.start()
+
+    def cancelLoad(self) -> None:
+        if self.loadTask:
+            self.loadTask.cancel()
+
+    def _abandonLoad(self) -> None:
+        self.cancelLoad()
+        self.loadTask = None
+        self.menuBar.disableCommand("File", "Cancel loading")
+        self.menuBar.enableCommand("File", "Save")
+
+    def _askPattern(self, title: str, regex: bool) -> bool:
+        text = simpledialog.askstring(
+            title, "Regular expression:" if regex else "Text:"
+        )
+        if not text:
+            return False
+
+        try:
+            self.searchEngine.setPattern(text, regex)
+        except re.error as e:
+            messagebox.showerror("Error", f"Invalid pattern: {e}")
+            return False
+
+        return True
+
+    def find(self, regex: bool = False) -> None:
+        if self._askPattern("Find", regex):
+            self.findNext()
+
+    def replaceAll(self) -> None:
+        if self.searchEngine.pattern is None:
+            self._askPattern("Replace all", False)
+
+        pattern = self.searchEngine.pattern
+        if pattern is None:
+            return
+
+        text = simpledialog.askstring("Replace all", "Replace with:")
+        if text is None:
+            return
+
+        if not self.searchEngine.regex:
+            text = text.replace("\\", "\\\\")
+
+        self.cancelSearch()
+        try:
+            action = self.textEditorModel.replaceAll(pattern, text)
+        except re.error as e:
+            messagebox.showerror("Error", f"Invalid replacement: {e}")
+            return
+
+        if action:
+            self.undoManager.push(action)
+        else:
+            self.statusbar.setProgressLabel("Not found")
+
+    def findNext(self) -> None:
+        self._startSearch(True)
+
+    def findPrevious(self) -> None:
+        self._startSearch(False)
+
+    def cancelSearch(self) -> None:
+        if self.searchJob:
+            self.searchJob = None
+            self.statusbar.setProgressLabel("")
+
+    def enableSearchIndex(self) -> None:
+        self.searchEngine.enableIndex()
+        self.menuBar.disableCommand("Search", "Enable search index")
+        self.menuBar.enableCommand("Search", "Disable search index")
+        self.menuBar.enableCommand("Search", "Search index statistics")
+        self._startIndexing()
+
+    def disableSearchIndex(self) -> None:
+        self.indexJob = None
+        self.searchEngine.disableIndex()
+        self.menuBar.enableCommand("Search", "Enable search index")
+        self.menuBar.disableCommand("Search", "Disable search index")
+        self.menuBar.disableCommand("Search", "Search index statistics")
+
+    def showSearchIndexStatistics(self) -> None:
+        index = self.searchEngine.index
+        if index is None:
+            return
+
+        size = index.memoryUsage()
+        length = max(self.textEditorModel.textLength(), 1)
+        messagebox.showinfo(
+            "Search index",
+            f"Indexed: {index.progress():.0%}\n"
+            f"Memory: {size / 1024:.1f} KiB ({size / length:.1%} of the text)",
+        )
+
+    def _startIndexing(self) -> None:
+        if self.searchEngine.index is None or self.indexJob is not None:
+            return
+
+        job = self.searchEngine.index.build()
+        self.indexJob = job
+        self.after(INDEX_DELAY, self._runIndexing, job)
+
+    def _runIndexing(self, job: Iterator[None]) -> None:
+        if job is not self.indexJob:
+            return
+
+        deadline = perf_counter() + SEARCH_SLICE
+        for _ in job:
+            if perf_counter() > deadline:
+                self.after(INDEX_DELAY, self._runIndexing, job)
+                return
+
+        self.indexJob = None
+
+    def _startSearch(self, forward: bool) -> None:
+        if self.searchEngine.pattern is None:
+            return
+
+        self._startIndexing()
+
+        sr = self.textEditorModel.getSelectionRange()
+        if sr:
+            s_row, s_col, e_row, e_col = sr.getCoords()
+            location = Location(e_row, e_col) if forward else Location(s_row, s_col)
+        else:
+            location = self.textEditorModel.getCursorLocation()
+
+        job = self.searchEngine.search(location, forward)
+        self.searchJob = job
+        self.searchForward = forward
+        self.searchGeneration = self.searchEngine.generation
+        self.statusbar.setProgressLabel("Searching")
+        self._runSearch(job)
+
+    def _runSearch(self, job: Iterator[LocationRange | None]) -> None:
+        if job is not self.searchJob:
+            return
+
+        if self.searchGeneration != self.searchEngine.generation:
+            self._startSearch(self.searchForward)
+            return
+
+        deadline = perf_counter() + SEARCH_SLICE
+        for match in job:
+            if match is not None:
+                self.searchJob = None
+                self.statusbar.setProgressLabel("")
+                with self.textEditorModel.transaction():
+                    self.textEditorModel.setSelectionRange(match)
+                    self.textEditorModel.setCursorLocation(match.end)
+                return
+
+            if perf_counter() > deadline:
+                self.after(1, self._runSearch, job)
+                return
+
+        self.searchJob = None
+        self.statusbar.setProgressLabel("Not found")
+
+    def _readFile(
+        self, task: BackgroundTask, file_path: str, digests: list[str]
+    ) -> None:
+        size = max(os.path.getsize(file_path), 1)
+        hasher = UndoHistory.digestHasher()
+        decoder = IncrementalNewlineDecoder(
+            getincrementaldecoder("utf-8")(), translate=True
+        )
+
+        with open(file_path, "rb") as file:
+            pending = ""
+
+            while not task.isCancelled():
+                chunk = file.read(LOAD_CHUNK_SIZE)
+                hasher.update(chunk)
+                data = pending + decoder.decode(chunk, final=not chunk)
+
+                if not chunk:
+                    digests.append(hasher.hexdigest())
+                    if data:
+                        task.post(([data], 1.0))
+                    return
+
+                lines = data.split("\n")
+                pending = lines.pop()
+                if lines:
+                    task.post((lines, file.tell() / size))
+
+    def _loadLines(self, messages: list[tuple[list[str], float]]) -> None:
+        lines = [line for chunk, _ in messages for line in chunk]
+
+        if self.load_started:
+            self.textEditorModel.appendLines(lines)
+        else:
+            self.load_started = True
+            self.textEditorModel.setLines(lines)
+
+        progress = min(messages[-1][1], 1.0)
+        self.statusbar.setProgressLabel(f"Loading {progress:.0%}")
+
+    def _loadDone(
+        self,
+        task: BackgroundTask,
+        error: BaseException | None,
+        file_path: str,
+        digests: list[str],
+    ) -> None:
+        if task is not self.loadTask:
+            return
+
+        self.loadTask = None
+        self.menuBar.disableCommand("File", "Cancel loading")
+        self.menuBar.enableCommand("File", "Save")
+
+        if error:
+            self.load_partial = True
+            self.statusbar.setProgressLabel("Partially loaded")
+            messagebox.showerror("Error", f"Could not open file: {error}")
+        elif task.isCancelled():
+            self.load_partial = True
+            self.statusbar.setProgressLabel("Loading cancelled, partially loaded")
+        else:
+            self.statusbar.setProgressLabel("")
+            self.undoManager.setHistoryLoader(
+                lambda: self._loadHistory(file_path, digests[0])
+            )
+
+    def _loadHistory(
+        self, file_path: str, digest: str | None
+    ) -> tuple[list[EditAction], list[EditAction]] | None:
+        history = self.undoHistory.load(file_path, digest)
+        if history is None:
+            return None
+
+        undoRecords, redoRecords = history
+
+        try:
+            return (
+                [actionFromRecord(record) for record in undoRecords],
+                [actionFromRecord(record) for record in redoRecords],
+            )
+        except (ImportError, AttributeError, TypeError, ValueError):
+            return None
 
     def saveFile(self) -> None:
+        if self.loadTask:
+            return
+
+        if self.load_partial and not messagebox.askyesno(
+            "Save",
+            "The document was only partially loaded. Save it anyway?",
+        ):
+            return
+
         file_path = filedialog.asksaveasfilename(defaultextension=".txt")
         if not file_path:
             return
 
+        if self.saveTask:
+            self.saveTask.cancel()
+
+        self.undoManager.loadHistory()
+        undoRecords, redoRecords = self.undoManager.toRecords()
+
+        snapshot = self.textEditorModel.snapshot()
+        task = BackgroundTask(
+            self,
+            lambda current: self._writeFile(
+                current, snapshot, file_path, undoRecords, redoRecords
+            ),
+            self._saveProgress,
+            lambda error: self._saveDone(task, error),
+        )
+        self.saveTask = task
+        self.statusbar.setProgressLabel("Saving 0%")
+        task.start()
+
+    def _writeFile(
+        self,
+        task: BackgroundTask,
+        snapshot: Document,
+        file_path: str,
+        undoRecords: list[list[Any]],
+        redoRecords: list[list[Any]],
+    ) -> None:
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        total = snapshot.lineCount()
+
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write("\n".join(self.textEditorModel.getLines()))
+            with open(fd, "w", encoding="utf-8") as file:
+                lines = snapshot.allLines()
+                row = 0
+
+                while row < total:
+                    if task.isCancelled():
+                        raise InterruptedError("save cancelled")
+
+                    chunk = list(islice(lines, SAVE_CHUNK_LINES))
+                    if row:
+                        file.write("\n")
+                    file.write("\n".join(chunk))
+
+                    row += len(chunk)
+                    task.post(row / total)
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+        with suppress(OSError):
+            digest = UndoHistory.fileDigest(file_path)
+            self.undoHistory.save(file_path, digest, undoRecords, redoRecords)
+
+    def _saveProgress(self, messages: list[float]) -> None:
+        self.statusbar.setProgressLabel(f"Saving {messages[-1]:.0%}")
+
+    def _saveDone(self, task: BackgroundTask, error: BaseException | None) -> None:
+        if task is not self.saveTask:
+            return
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not save file: {e}")
+        self.saveTask = None
+
+        if error:
+            self.statusbar.setProgressLabel("")
+            messagebox.showerror("Error", f"Could not save file: {error}")
+        else:
+            self.statusbar.setProgressLabel("Saved")
+
+    def revertHistory(self) -> None:
+        start, end = self.undoManager.getHistoryBounds()
+        position = simpledialog.askinteger(
+            "Revert to",
+            f"History state ({start}-{end}, current "
+            f"{self.undoManager.getHistoryPosition()}):",
+            minvalue=start,
+            maxvalue=end,
+        )
+
+        if position is not None:
+            self.undoManager.revertTo(position)
 
     def _setMenuCommands(self) -> None:
         self.menuBar.setCommand("File", "Open", self.openFile)
         self.menuBar.setCommand("File", "Save", self.saveFile)
+        self.menuBar.setCommand("File", "Cancel loading", self.cancelLoad)
+        self.menuBar.setCommand("Plugins", "Cancel plugin", self.cancelPlugin)
         self.menuBar.setCommand("File", "Exit", self.master.quit)
         self.menuBar.setCommand("Edit", "Undo", lambda: self.undoManager.undo(None))
         self.menuBar.setCommand("Edit", "Redo", lambda: self.undoManager.redo(None))
+        self.menuBar.setCommand("Edit", "Revert to...", self.revertHistory)
+        self.menuBar.setCommand("Search", "Find...", self.find)
+        self.menuBar.setCommand("Search", "Find regex...", lambda: self.find(True))
+        self.menuBar.setCommand("Search", "Find next", self.findNext)
+        self.menuBar.setCommand("Search", "Find previous", self.findPrevious)
+        self.menuBar.setCommand("Search", "Replace all...", self.replaceAll)
+        self.menuBar.setCommand("Search", "Enable search index", self.enableSearchIndex)
+        self.menuBar.setCommand(
+            "Search", "Disable search index", self.disableSearchIndex
+        )
+        self.menuBar.setCommand(
+            "Search", "Search index statistics", self.showSearchIndexStatistics
+        )
         self.menuBar.setCommand(
             "Edit",
             "Cut",
@@ -367,12 +973,72 @@ class TextEditor(
 
     def setPlugins(self, plugins: list[Plugin]) -> None:
         for plugin in plugins:
-            self.menuBar.pluginsMenu.add_command(
-                label=plugin.getName(),
-                command=lambda p=plugin: p.execute(
+            if isinstance(plugin, BackgroundPlugin):
+                command = lambda p=plugin: self.runPlugin(p)
+            else:
+                command = lambda p=plugin: p.execute(
                     self.textEditorModel, self.undoManager, self.clipboardStack
-                ),
+                )
+
+            self.menuBar.pluginsMenu.add_command(
+                label=plugin.getName(), command=command
+            )
+
+    def runPlugin(self, plugin: BackgroundPlugin) -> None:
+        if self.pluginTask:
+            self.pluginTask.cancel()
+
+        snapshot = self.textEditorModel.snapshot()
+        diffs: list[LineDiff] = []
+
+        task = BackgroundTask(
+            self,
+            lambda current: diffs.extend(plugin.compute(snapshot, current)),
+            lambda messages: self._pluginProgress(plugin, messages),
+            lambda error: self._pluginDone(task, plugin, diffs, error),
+        )
+        self.pluginTask = task
+        self.menuBar.enableCommand("Plugins", "Cancel plugin")
+        self.statusbar.setProgressLabel(f"{plugin.getName()} 0%")
+        task.start()
+
+    def cancelPlugin(self) -> None:
+        if self.pluginTask:
+            self.pluginTask.cancel()
+
+    def _pluginProgress(self, plugin: BackgroundPlugin, messages: list[float]) -> None:
+        self.statusbar.setProgressLabel(f"{plugin.getName()} {messages[-1]:.0%}")
+
+    def _pluginDone(
+        self,
+        task: BackgroundTask,
+        plugin: BackgroundPlugin,
+        diffs: list[LineDiff],
+        error: BaseException | None,
+    ) -> None:
+        if task is not self.pluginTask:
+            return
+
+        self.pluginTask = None
+        self.menuBar.disableCommand("Plugins", "Cancel plugin")
+
+        if task.isCancelled():
+            self.statusbar.setProgressLabel(f"{plugin.getName()} cancelled")
+        elif error:
+            self.statusbar.setProgressLabel("")
+            messagebox.showerror("Error", f"{plugin.getName()} failed: {error}")
+        elif self.textEditorModel.hasConflicts(diffs):
+            self.statusbar.setProgressLabel("")
+            messagebox.showwarning(
+                plugin.getName(),
+                "The document was edited while the plugin was running. "
+                "Its result was discarded.",
             )
+        else:
+            self.statusbar.setProgressLabel("")
+            action = self.textEditorModel.replaceLines(diffs)
+            if action:
+                self.undoManager.push(action)
 
     def _setToolbarCommands(self) -> None:
         self.toolbar.setCommand("undo", lambda: self.undoManager.undo(None))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
+from contextlib import contextmanager
 from location.location import Location
 from location.location_range import LocationRange
 from action.insert_char_action import InsertCharAction
@@ -11,34 +12,77 @@ from action.delete_before_newline_action import DeleteBeforeNewlineAction
 from action.delete_after_newline_action import DeleteAfterNewlineAction
 from action.delete_range_action import DeleteRangeAction
 from action.compound_action import CompoundAction
-from tkinter import Event
+from action.line_diff_action import LineDiffAction
+from text.text_change import TextChange
+from text.offset_index import OffsetIndex
+from text.text_statistics import TextStatistics
+from document.document import commonPrefix, commonSuffix, documentFactory, textEnd
 
 if TYPE_CHECKING:
+    import re
+    from tkinter import Event
     from cursor.cursor_observer import CursorObserver
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
     from text.text_observer import TextObserver
     from action.edit_action import EditAction
     from clipboard.clipboard_stack import ClipboardStack
     from text.select_observer import SelectObserver
+    from text.edit_observer import EditObserver
+    from document.document import Document, LineDiff
 
 
 class TextEditorModel:
-    def __init__(self, text: str) -> None:
-        self.lines: list[str] = text.split("\n")
+    def __init__(self, text: str, documentName: str = "list") -> None:
+        self.document: Document = documentFactory(documentName)(text)
         self.selectionRange: LocationRange | None = None
         self.cursorLocation: Location = Location()
 
         self.cursorObservers: list[CursorObserver] = []
         self.textObservers: list[TextObserver] = []
         self.selectObservers: list[SelectObserver] = []
+        self.editObservers: list[EditObserver] = []
+
+        self.offsetIndex: OffsetIndex = OffsetIndex(self.document)
+        self.addEditObserver(self.offsetIndex)
+
+        self.statistics: TextStatistics = TextStatistics(self.document)
+        self.addEditObserver(self.statistics)
+
+        self.transactionDepth: int = 0
+        self.pendingCursor: bool = False
+        self.pendingSelect: bool = False
+        self.pendingText: bool = False
+        self.pendingTextChange: TextChange | None = None
 
     def allLines(self) -> Iterator[str]:
-        for line in self.lines:
-            yield line
+        return self.document.allLines()
 
     def linesRange(self, index1: int, index2: int) -> Iterator[str]:
-        for line in self.lines[index1:index2]:
-            yield line
+        return self.document.linesRange(index1, index2)
+
+    def getLine(self, row: int) -> str:
+        return self.document.getLine(row)
+
+    def lineCount(self) -> int:
+        return self.document.lineCount()
+
+    def lineLength(self, row: int) -> int:
+        return self.document.lineLength(row)
+
+    def offsetOf(self, location: Location) -> int:
+        return self.offsetIndex.offsetOf(location)
+
+    def locationAt(self, offset: int) -> Location:
+        return self.offsetIndex.locationAt(offset)
+
+    def textLength(self) -> int:
+        return self.offsetIndex.length()
+
+    def wordCount(self) -> int:
+        return self.statistics.wordCount()
+
+    def charCount(self) -> int:
+        return self.statistics.charCount()
 
     def addCursorObserver(self, cursorObserver: CursorObserver) -> None:
         self.cursorObservers.append(cursorObserver)
@@ -47,6 +91,10 @@ class TextEditorModel:
         self.cursorObservers.remove(cursorObserver)
 
     def notifyCursorObservers(self) -> None:
+        if self.transactionDepth:
+            self.pendingCursor = True
+            return
+
         for cursorObserver in self.cursorObservers:
             cursorObserver.updateCursorLocation(self.cursorLocation)
 
@@ -56,9 +104,16 @@ class TextEditorModel:
     def removeTextObserver(self, textObserver: TextObserver) -> None:
         self.textObservers.remove(textObserver)
 
-    def notifyTextObservers(self) -> None:
+    def notifyTextObservers(self, change: TextChange | None = None) -> None:
+        if self.transactionDepth:
+            self.pendingText = True
+            if change is not None:
+                pending = self.pendingTextChange
+                self.pendingTextChange = pending.merge(change) if pending else change
+            return
+
         for textObserver in self.textObservers:
-            textObserver.updateText()
+            textObserver.updateText(change)
 
     def addSelectObserver(self, selectObserver: SelectObserver) -> None:
         self.selectObservers.append(selectObserver)
@@ -67,337 +122,287 @@ class TextEditorModel:
         self.selectObservers.remove(selectObserver)
 
     def notifySelectObservers(self) -> None:
+        if self.transactionDepth:
+            self.pendingSelect = True
+            return
+
         for selectObserver in self.selectObservers:
             selectObserver.updateSelect(self.selectionRange is not None)
 
-    def moveCursorLeft(self, event: Event | None) -> None:
+    def addEditObserver(self, editObserver: EditObserver) -> None:
+        self.editObservers.append(editObserver)
+
+    def removeEditObserver(self, editObserver: EditObserver) -> None:
+        self.editObservers.remove(editObserver)
+
+    def _insertText(self, row: int, col: int, text: str) -> None:
+        self.document.insert(row, col, text)
+
+        for editObserver in self.editObservers:
+            editObserver.insertText(row, col, text)
+
+    def _deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> str:
+        text = self.document.delete(s_row, s_col, e_row, e_col)
+
+        for editObserver in self.editObservers:
+            editObserver.deleteText(s_row, s_col, e_row, e_col)
+
+        return text
+
+    def _replaceText(self, diffs: list[LineDiff]) -> None:
+        self.document.replaceLines(diffs)
+
+        for editObserver in self.editObservers:
+            editObserver.replaceLines(diffs)
+
+    def _resetText(self) -> None:
+        for editObserver in self.editObservers:
+            editObserver.resetText(self.document)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        self.transactionDepth += 1
+
+        try:
+            yield
+        finally:
+            self.transactionDepth -= 1
+
+            if not self.transactionDepth:
+                self._flushNotifications()
+
+    def _flushNotifications(self) -> None:
+        text, change = self.pendingText, self.pendingTextChange
+        select, cursor = self.pendingSelect, self.pendingCursor
+
+        self.pendingText, self.pendingTextChange = False, None
+        self.pendingSelect, self.pendingCursor = False, False
+
+        if text:
+            self.notifyTextObservers(change)
+        if select:
+            self.notifySelectObservers()
+        if cursor:
+            self.notifyCursorObservers()
+
+    def moveCursorLeft(self, event: Event | None = None) -> None:
         if event:
             self.selectionRange = None
             self.notifyTextObservers()
             self.notifySelectObservers()
 
-        if self.cursorLocation.col > 0:
-            self.cursorLocation.col -= 1
+        row, col = self.cursorLocation
+        if col > 0:
+            self.cursorLocation = Location(row, col - 1)
             self.notifyCursorObservers()
 
-        elif self.cursorLocation.row > 0:
-            self.cursorLocation.row -= 1
-            self.cursorLocation.col = len(self.lines[self.cursorLocation.row])
+        elif row > 0:
+            self.cursorLocation = Location(row - 1, self.document.lineLength(row - 1))
             self.notifyCursorObservers()
 
-    def moveCursorRight(self, event: Event | None) -> None:
+    def moveCursorRight(self, event: Event | None = None) -> None:
         if event:
             self.selectionRange = None
             self.notifyTextObservers()
             self.notifySelectObservers()
 
-        if self.cursorLocation.col < len(self.lines[self.cursorLocation.row]):
-            self.cursorLocation.col += 1
+        row, col = self.cursorLocation
+        if col < self.document.lineLength(row):
+            self.cursorLocation = Location(row, col + 1)
             self.notifyCursorObservers()
 
-        elif self.cursorLocation.row < len(self.lines) - 1:
-            self.cursorLocation.row += 1
-            self.cursorLocation.col = 0
+        elif row < self.document.lineCount() - 1:
+            self.cursorLocation = Location(row + 1, 0)
             self.notifyCursorObservers()
 
-    def moveCursorUp(self, event: Event | None) -> None:
+    def moveCursorUp(self, event: Event | None = None) -> None:
         if event:
             self.selectionRange = None
             self.notifyTextObservers()
             self.notifySelectObservers()
 
-        if self.cursorLocation.row > 0:
-            self.cursorLocation.row -= 1
-            self.cursorLocation.col = min(
-                len(self.lines[self.cursorLocation.row]), self.cursorLocation.col
+        row, col = self.cursorLocation
+        if row > 0:
+            self.cursorLocation = Location(
+                row - 1, min(self.document.lineLength(row - 1), col)
             )
             self.notifyCursorObservers()
 
-    def moveCursorDown(self, event: Event | None) -> None:
+    def moveCursorDown(self, event: Event | None = None) -> None:
         if event:
             self.selectionRange = None
             self.notifyTextObservers()
             self.notifySelectObservers()
 
-        if self.cursorLocation.row < len(self.lines) - 1:
-            self.cursorLocation.row += 1
-            self.cursorLocation.col = min(
-                len(self.lines[self.cursorLocation.row]), self.cursorLocation.col
+        row, col = self.cursorLocation
+        if row < self.document.lineCount() - 1:
+            self.cursorLocation = Location(
+                row + 1, min(self.document.lineLength(row + 1), col)
             )
             self.notifyCursorObservers()
 
     def deleteBefore(self, location: Location | None = None) -> EditAction | None:
-        if self.selectionRange:
+        if location is None and self.selectionRange:
             return self.deleteRange(self.selectionRange)
 
         else:
             if location is None:
-                location = Location(self.cursorLocation.row, self.cursorLocation.col)
+                location = self.cursorLocation
             else:
+                if self.selectionRange:
+                    self.selectionRange = None
+                    self.notifySelectObservers()
+
                 self.cursorLocation = location
                 self.moveCursorRight(None)
+                location = self.cursorLocation
 
             row, col = location.getCoords()
-            line = self.lines[row]
 
             if col > 0:
-                deleted_text = line[col - 1]
-
-                line = line[: col - 1] + line[col:]
-                self.lines[row] = line
+                deleted_text = self._deleteText(row, col - 1, row, col)
 
                 self.moveCursorLeft(None)
 
-                self.notifyTextObservers()
-
-                location = Location(self.cursorLocation.row, self.cursorLocation.col)
+                self.notifyTextObservers(TextChange(row, row + 1, row + 1))
 
-                return DeleteBeforeCharAction(self, deleted_text, location)
+                return DeleteBeforeCharAction(deleted_text, self.cursorLocation)
 
             elif row > 0:
                 self.moveCursorLeft(None)
 
-                prev_line = self.lines[row - 1]
-                new_line = prev_line + line
-                self.lines[row - 1] = new_line
-                self.lines.pop(row)
-
-                self.notifyTextObservers()
+                self._deleteText(row - 1, self.document.lineLength(row - 1), row, 0)
 
-                location = Location(self.cursorLocation.row, self.cursorLocation.col)
+                self.notifyTextObservers(TextChange(row - 1, row + 1, row))
 
-                return DeleteBeforeNewlineAction(self, location)
+                return DeleteBeforeNewlineAction(self.cursorLocation)
 
     def deleteAfter(self, location: Location | None = None) -> EditAction | None:
-        if self.selectionRange:
+        if location is None and self.selectionRange:
             return self.deleteRange(self.selectionRange)
 
         else:
             if location is None:
-                location = Location(self.cursorLocation.row, self.cursorLocation.col)
+                location = self.cursorLocation
             else:
+                if self.selectionRange:
+                    self.selectionRange = None
+                    self.notifySelectObservers()
+
                 self.cursorLocation = location
                 self.notifyCursorObservers()
 
             row, col = location.getCoords()
-            line = self.lines[row]
 
-            if col < len(line):
-                deleted_text = line[col]
+            if col < self.document.lineLength(row):
+                deleted_text = self._deleteText(row, col, row, col + 1)
 
-                line = line[:col] + line[col + 1 :]
-                self.lines[row] = line
+                self.notifyTextObservers(TextChange(row, row + 1, row + 1))
 
-                self.notifyTextObservers()
+                return DeleteAfterCharAction(deleted_text, location)
 
-                return DeleteAfterCharAction(self, deleted_text, location)
+            elif row < self.document.lineCount() - 1:
+                self._deleteText(row, col, row + 1, 0)
 
-            elif row < len(self.lines) - 1:
-                next_line = self.lines[row + 1]
-                line += next_line
-                self.lines[row] = line
-                self.lines.pop(row + 1)
+                self.notifyTextObservers(TextChange(row, row + 2, row + 1))
 
-                self.notifyTextObservers()
-
-                return DeleteAfterNewlineAction(self, location)
+                return DeleteAfterNewlineAction(location)
 
     def deleteRange(self, locationRange: LocationRange) -> EditAction:
         s_row, s_col, e_row, e_col = locationRange.getCoords()
-        cursor_location = Location(self.cursorLocation.row, self.cursorLocation.col)
-
-        if s_row == e_row:
-            line = self.lines[s_row]
-            deleted_text = line[s_col:e_col]
-            line = line[:s_col] + line[e_col:]
-            self.lines[s_row] = line
-
-        else:
-            s_line = self.lines[s_row]
-            e_line = self.lines[e_row]
-            line = s_line[:s_col] + e_line[e_col:]
-            self.lines[s_row] = line
-
-            deleted_text = [s_line[s_col:]]
-
-            for i in range(s_row + 1, e_row):
-                deleted_text.append(self.lines[i])
+        cursor_location = self.cursorLocation
 
-            deleted_text.append(e_line[:e_col])
-
-            deleted_text = "\n".join(deleted_text)
-
-            for _ in range(s_row, e_row):
-                self.lines.pop(s_row + 1)
+        deleted_text = self._deleteText(s_row, s_col, e_row, e_col)
 
         self.cursorLocation = Location(s_row, s_col)
         self.selectionRange = None
         self.notifySelectObservers()
         self.notifyCursorObservers()
-        self.notifyTextObservers()
+        self.notifyTextObservers(TextChange(s_row, e_row + 1, s_row + 1))
 
-        return DeleteRangeAction(self, deleted_text, locationRange, cursor_location)
+        return DeleteRangeAction(deleted_text, locationRange, cursor_location)
 
     def _undo_delete_range(
         self, text: str, locationRange: LocationRange, cursorLocation: Location
     ) -> None:
-        s_row, s_col, e_row, e_col = locationRange.getCoords()
-        if "\n" in text:
-            self._insert_multiline(text, Location(s_row, s_col))
-        else:
-            self._insert_char(text, Location(s_row, s_col))
-
-        self.cursorLocation = Location(cursorLocation.row, cursorLocation.col)
-        self.selectionRange = locationRange
-
-        self.notifySelectObservers()
-        self.notifyTextObservers()
-        self.notifyCursorObservers()
-
-    def selectLeft(self, event: Event | None) -> None:
-        sr = self.selectionRange
-        if sr:
-            self.moveCursorLeft(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if sr.start == Location(e_row, e_col):
-                self.selectionRange = None
+        with self.transaction():
+            s_row, s_col, e_row, e_col = locationRange.getCoords()
+            if "\n" in text:
+                self._insert_multiline(text, Location(s_row, s_col))
             else:
-                self.selectionRange = LocationRange(sr.start, Location(e_row, e_col))
-            self.notifySelectObservers()
-            self.notifyTextObservers()
+                self._insert_char(text, Location(s_row, s_col))
 
-        else:
-            s_row, s_col = self.cursorLocation.getCoords()
+            self.cursorLocation = cursorLocation
+            self.selectionRange = locationRange
 
-            self.moveCursorLeft(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if Location(s_row, s_col) == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(
-                    Location(s_row, s_col), Location(e_row, e_col)
-                )
             self.notifySelectObservers()
             self.notifyTextObservers()
+            self.notifyCursorObservers()
 
-    def selectRight(self, event: Event | None) -> None:
+    def _extendSelection(self, moveCursor: Callable[[Event | None], None]) -> None:
         sr = self.selectionRange
-        if sr:
-            self.moveCursorRight(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if sr.start == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(sr.start, Location(e_row, e_col))
-            self.notifySelectObservers()
-            self.notifyTextObservers()
+        start = sr.start if sr else self.cursorLocation
 
-        else:
-            s_row, s_col = self.cursorLocation.getCoords()
+        moveCursor(None)
 
-            self.moveCursorRight(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if Location(s_row, s_col) == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(
-                    Location(s_row, s_col), Location(e_row, e_col)
-                )
-            self.notifySelectObservers()
-            self.notifyTextObservers()
+        end = self.cursorLocation
+        self.selectionRange = None if start == end else LocationRange(start, end)
+        self.notifySelectObservers()
+        self.notifyTextObservers()
 
-    def selectUp(self, event: Event | None) -> None:
-        sr = self.selectionRange
-        if sr:
-            self.moveCursorUp(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if sr.start == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(sr.start, Location(e_row, e_col))
-            self.notifySelectObservers()
-            self.notifyTextObservers()
+    def selectLeft(self, event: Event | None = None) -> None:
+        self._extendSelection(self.moveCursorLeft)
 
-        else:
-            s_row, s_col = self.cursorLocation.getCoords()
+    def selectRight(self, event: Event | None = None) -> None:
+        self._extendSelection(self.moveCursorRight)
 
-            self.moveCursorUp(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if Location(s_row, s_col) == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(
-                    Location(s_row, s_col), Location(e_row, e_col)
-                )
-            self.notifySelectObservers()
-            self.notifyTextObservers()
+    def selectUp(self, event: Event | None = None) -> None:
+        self._extendSelection(self.moveCursorUp)
 
-    def selectDown(self, event: Event | None) -> None:
-        sr = self.selectionRange
-        if sr:
-            self.moveCursorDown(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if sr.start == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(sr.start, Location(e_row, e_col))
-            self.notifySelectObservers()
-            self.notifyTextObservers()
-
-        else:
-            s_row, s_col = self.cursorLocation.getCoords()
-
-            self.moveCursorDown(None)
-            e_row, e_col = self.cursorLocation.getCoords()
-            if Location(s_row, s_col) == Location(e_row, e_col):
-                self.selectionRange = None
-            else:
-                self.selectionRange = LocationRange(
-                    Location(s_row, s_col), Location(e_row, e_col)
-                )
-            self.notifySelectObservers()
-            self.notifyTextObservers()
+    def selectDown(self, event: Event | None = None) -> None:
+        self._extendSelection(self.moveCursorDown)
 
     def keyPress(self, event: Event) -> EditAction | None:
         return self.insert(event.char)
 
     def insert(self, text) -> EditAction | None:
-        delete_action, insert_action = None, None
-        chars = text[:].replace("\n", "")
+        with self.transaction():
+            delete_action, insert_action = None, None
+            chars = text[:].replace("\n", "")
 
-        if text == "\r":
-            if self.selectionRange:
-                delete_action = self.deleteRange(self.selectionRange)
+            if text == "\r":
+                if self.selectionRange:
+                    delete_action = self.deleteRange(self.selectionRange)
 
-            location = self.cursorLocation
+                location = self.cursorLocation
 
-            self._insert_newline(self.cursorLocation)
+                self._insert_newline(self.cursorLocation)
 
-            insert_action = InsertNewlineAction(self, location)
+                insert_action = InsertNewlineAction(location)
 
-        elif text != "" and chars.isprintable():
-            if self.selectionRange:
-                delete_action = self.deleteRange(self.selectionRange)
+            elif text != "" and chars.isprintable():
+                if self.selectionRange:
+                    delete_action = self.deleteRange(self.selectionRange)
 
-            location = self.cursorLocation
+                location = self.cursorLocation
 
-            if "\n" not in text:
-                self._insert_char(text, self.cursorLocation)
+                if "\n" not in text:
+                    self._insert_char(text, self.cursorLocation)
 
-                insert_action = InsertCharAction(self, text, location)
+                    insert_action = InsertCharAction(text, location)
 
-            else:
-                self._insert_multiline(text, self.cursorLocation)
+                else:
+                    self._insert_multiline(text, self.cursorLocation)
 
-                insert_action = InsertMultilineAction(self, text, location)
+                    insert_action = InsertMultilineAction(text, location)
 
-        if not insert_action:
-            return
+            if not insert_action:
+                return
 
-        if delete_action:
-            return CompoundAction([delete_action, insert_action])
-        else:
-            return insert_action
+            if delete_action:
+                return CompoundAction([delete_action, insert_action])
+            else:
+                return insert_action
 
     def _insert_char(self, text: str, location: Location) -> None:
         if self.selectionRange:
@@ -405,14 +410,11 @@ class TextEditorModel:
             self.notifySelectObservers()
 
         row, col = location.getCoords()
-        line = self.lines[row]
-
-        line = line[:col] + text + line[col:]
-        self.lines[row] = line
+        self._insertText(row, col, text)
 
         self.cursorLocation = Location(row, col + len(text))
 
-        self.notifyTextObservers()
+        self.notifyTextObservers(TextChange(row, row + 1, row + 1))
         self.notifyCursorObservers()
 
     def _undo_insert_char(self, text: str, location: Location) -> None:
@@ -421,14 +423,11 @@ class TextEditorModel:
             self.notifySelectObservers()
 
         row, col = location.getCoords()
-        line = self.lines[row]
-
-        line = line[:col] + line[col + len(text) :]
-        self.lines[row] = line
+        self._deleteText(row, col, row, col + len(text))
 
-        self.cursorLocation = Location(row, col)
+        self.cursorLocation = location
 
-        self.notifyTextObservers()
+        self.notifyTextObservers(TextChange(row, row + 1, row + 1))
         self.notifyCursorObservers()
 
     def _insert_newline(self, location: Location) -> None:
@@ -437,18 +436,12 @@ class TextEditorModel:
             self.notifySelectObservers()
 
         row, col = location.getCoords()
-
-        line = self.lines[row]
-        line_1 = line[:col]
-        line_2 = line[col:]
-
-        self.lines[row] = line_1
-        self.lines.insert(row + 1, line_2)
+        self._insertText(row, col, "\n")
 
         self.cursorLocation = Location(row + 1, 0)
 
         self.notifyCursorObservers()
-        self.notifyTextObservers()
+        self.notifyTextObservers(TextChange(row, row + 1, row + 2))
 
     def _undo_insert_newline(self, location: Location) -> None:
         if self.selectionRange:
@@ -456,18 +449,12 @@ class TextEditorModel:
             self.notifySelectObservers()
 
         row, col = location.getCoords()
-
-        line_1 = self.lines[row]
-        line_2 = self.lines[row + 1]
-        line = line_1 + line_2
-
-        self.lines[row] = line
-        self.lines.pop(row + 1)
+        self._deleteText(row, self.document.lineLength(row), row + 1, 0)
 
         self.cursorLocation = location
 
         self.notifyCursorObservers()
-        self.notifyTextObservers()
+        self.notifyTextObservers(TextChange(row, row + 2, row + 1))
 
     def _insert_multiline(self, text: str, location: Location) -> None:
         if self.selectionRange:
@@ -475,23 +462,12 @@ class TextEditorModel:
             self.notifySelectObservers()
 
         row, col = location.getCoords()
-        line = self.lines[row]
+        self._insertText(row, col, text)
 
-        pre_insert, post_insert = line[:col], line[col:]
         n = text.count("\n")
-        lines = text.split("\n")
-        col = len(lines[-1])
-        lines[0], lines[-1] = pre_insert + lines[0], lines[-1] + post_insert
+        self.cursorLocation = Location(row + n, len(text) - text.rfind("\n") - 1)
 
-        lines.reverse()
-        self.lines.pop(row)
-
-        for line in lines:
-            self.lines.insert(row, line)
-
-        self.cursorLocation = Location(row + n, col)
-
-        self.notifyTextObservers()
+        self.notifyTextObservers(TextChange(row, row + 1, row + n + 1))
         self.notifyCursorObservers()
 
     def _undo_insert_multiline(self, text: str, location: Location) -> None:
@@ -500,68 +476,114 @@ class TextEditorModel:
             self.notifySelectObservers()
 
         row, col = location.getCoords()
-        line = self.lines[row]
-        pre_insert = line[:col]
 
         n = text.count("\n")
-        lines = text.split("\n")
-        col = len(lines[-1])
-        line = self.lines[row + n]
-        post_insert = line[col:]
+        self._deleteText(row, col, row + n, len(text) - text.rfind("\n") - 1)
+
+        self.cursorLocation = location
+
+        self.notifyTextObservers(TextChange(row, row + n + 1, row + 1))
+        self.notifyCursorObservers()
+
+    def replaceAll(self, pattern: re.Pattern[str], template: str) -> EditAction | None:
+        diffs = []
+
+        for row, line in enumerate(self.document.allLines()):
+            matches = pattern.finditer(line)
+            first = next(matches, None)
+            if first is None:
+                continue
+
+            last = first
+            for last in matches:
+                pass
+
+            start, end = first.start(), last.end()
+            replaced = pattern.sub(template, line)
+            removed = line[start:end]
+            inserted = replaced[start : len(replaced) - len(line) + end]
+
+            if removed != inserted:
+                diffs.append((row, start, removed, inserted))
+
+        return self.replaceLines(diffs)
+
+    def transformLines(self, transform: Callable[[str], str]) -> EditAction | None:
+        diffs = []
 
-        self.lines[row] = pre_insert + post_insert
+        for row, line in enumerate(self.document.allLines()):
+            transformed = transform(line)
+            if transformed != line:
+                diffs.append((row, 0, line, transformed))
 
-        for _ in range(n):
-            self.lines.pop(row + 1)
+        return self.replaceLines(diffs)
+
+    def replaceLines(self, diffs: list[LineDiff]) -> EditAction | None:
+        if not diffs:
+            return
+
+        self._replace_lines(diffs)
+
+        return LineDiffAction(diffs)
+
+    def hasConflicts(self, diffs: list[LineDiff]) -> bool:
+        lineCount = self.document.lineCount()
+
+        for row, col, removed, _ in diffs:
+            e_row, e_col = textEnd(row, col, removed)
+
+            if e_row >= lineCount or e_col > self.document.lineLength(e_row):
+                return True
+
+            if self.document.getText(row, col, e_row, e_col) != removed:
+                return True
+
+        return False
+
+    def _replace_lines(self, diffs: list[LineDiff]) -> None:
+        if self.selectionRange:
+            self.selectionRange = None
+            self.notifySelectObservers()
+
+        old_count = self.document.lineCount()
+        self._replaceText(diffs)
+
+        row, col, _, _ = diffs[0]
+        last_row, last_col, removed, _ = diffs[-1]
+        end_row = textEnd(last_row, last_col, removed)[0] + 1
 
         self.cursorLocation = Location(row, col)
 
-        self.notifyTextObservers()
+        self.notifyTextObservers(
+            TextChange(row, end_row, end_row + self.document.lineCount() - old_count)
+        )
         self.notifyCursorObservers()
 
+    def _undo_replace_lines(self, diffs: list[LineDiff]) -> None:
+        inverse = []
+        shift = 0
+
+        for row, col, removed, inserted in diffs:
+            inverse.append((row + shift, col, inserted, removed))
+            shift += inserted.count("\n") - removed.count("\n")
+
+        self._replace_lines(inverse)
+
     def copy(self, event: Event | None, clipboardStack) -> None:
         sr = self.selectionRange
 
         if sr:
             s_row, s_col, e_row, e_col = sr.getCoords()
-
-            if s_row == e_row:
-                line = self.lines[s_row]
-                selected = line[s_col:e_col]
-                clipboardStack.push(selected)
-
-            else:
-                s_line = self.lines[s_row][s_col:]
-                lines = [line for line in self.linesRange(s_row + 1, e_row)]
-                e_line = self.lines[e_row][:e_col]
-
-                lines.insert(0, s_line)
-                lines.append(e_line)
-
-                clipboardStack.push("\n".join(lines))
+            clipboardStack.push(self.document.getText(s_row, s_col, e_row, e_col))
 
     def cut(self, event: Event | None, clipboardStack) -> EditAction | None:
         sr = self.selectionRange
 
         if sr:
             s_row, s_col, e_row, e_col = sr.getCoords()
+            clipboardStack.push(self.document.getText(s_row, s_col, e_row, e_col))
 
-            if s_row == e_row:
-                line = self.lines[s_row]
-                selected = line[s_col:e_col]
-                clipboardStack.push(selected)
-                return self.deleteRange(sr)
-
-            else:
-                s_line = self.lines[s_row][s_col:]
-                lines = [line for line in self.linesRange(s_row + 1, e_row)]
-                e_line = self.lines[e_row][:e_col]
-
-                lines.insert(0, s_line)
-                lines.append(e_line)
-
-                clipboardStack.push("\n".join(lines))
-                return self.deleteRange(sr)
+            return self.deleteRange(sr)
 
     def paste(self, clipboardStack: ClipboardStack) -> EditAction | None:
         try:
@@ -582,13 +604,61 @@ class TextEditorModel:
         return self.insert(text)
 
     def getLines(self) -> list[str]:
-        return self.lines
+        return self.document.getLines()
 
     def setLines(self, lines: list[str]) -> None:
-        self.moveCursorStart()
+        with self.transaction():
+            self.moveCursorStart()
+
+            old_count = self.document.lineCount()
+            self.document.setLines(lines)
+            self._resetText()
+            self.notifyTextObservers(
+                TextChange(0, old_count, self.document.lineCount())
+            )
 
-        self.lines = [""] if not lines else lines
-        self.notifyTextObservers()
+    def snapshot(self) -> Document:
+        return self.document.snapshot()
+
+    def appendLines(self, lines: list[str]) -> None:
+        old_count = self.document.lineCount()
+        col = self.document.lineLength(old_count - 1)
+        self.document.appendLines(lines)
+
+        if self.editObservers:
+            text = "\n" + "\n".join(lines)
+            for editObserver in self.editObservers:
+                editObserver.insertText(old_count - 1, col, text)
+
+        self.notifyTextObservers(
+            TextChange(old_count, old_count, self.document.lineCount())
+        )
+
+    def setDocument(self, document: Document) -> None:
+        with self.transaction():
+            self.moveCursorStart()
+
+            old_count = self.document.lineCount()
+            self.document = document
+            self._resetText()
+            self.notifyTextObservers(
+                TextChange(0, old_count, self.document.lineCount())
+            )
+
+    def restoreDocument(self, document: Document) -> None:
+        current = self.document
+        oldCount = current.lineCount()
+        newCount = document.lineCount()
+        limit = min(oldCount, newCount) - 1
+
+        start = commonPrefix(current, document, limit)
+        end = commonSuffix(current, document, limit - start)
+
+        removed = "\n".join(current.linesRange(start, oldCount - end))
+        inserted = "\n".join(document.linesRange(start, newCount - end))
+
+        if removed != inserted:
+            self._replace_lines([(start, 0, removed, inserted)])
 
     def getSelectionRange(self) -> LocationRange | None:
         return self.selectionRange
@@ -606,12 +676,11 @@ class TextEditorModel:
         self.notifyCursorObservers()
 
     def clear(self) -> EditAction | None:
-        if Location(0, 0) != Location(len(self.lines) - 1, len(self.lines[-1])):
-            return self.deleteRange(
-                LocationRange(
-                    Location(0, 0), Location(len(self.lines) - 1, len(self.lines[-1]))
-                )
-            )
+        last_row = self.document.lineCount() - 1
+        end = Location(last_row, self.document.lineLength(last_row))
+
+        if Location(0, 0) != end:
+            return self.deleteRange(LocationRange(Location(0, 0), end))
 
     def moveCursorStart(self) -> None:
         self.cursorLocation = Location(0, 0)
@@ -624,7 +693,8 @@ class TextEditorModel:
         self.notifyTextObservers()
 
     def moveCursorEnd(self) -> None:
-        row, col = len(self.lines) - 1, len(self.lines[-1])
+        row = self.document.lineCount() - 1
+        col = self.document.lineLength(row)
 
         self.cursorLocation = Location(row, col)
 
@@ -1,7 +1,12 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    from text.text_change import TextChange
+
 
 class TextObserver(ABC):
     @abstractmethod
-    def updateText(self) -> None:
+    def updateText(self, change: TextChange | None) -> None:
         pass
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from array import array
+from text.edit_observer import EditObserver
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from document.document import Document, LineDiff
+
+BUILD_LINES: int = 4096
+
+
+def lineCounts(line: str) -> tuple[int, int]:
+    words = line.split()
+    return len(words), sum(map(len, words))
+
+
+class TextStatistics(EditObserver):
+    def __init__(self, document: Document) -> None:
+        self.document: Document = document
+        self.words: array[int] = array("I")
+        self.chars: array[int] = array("I")
+        self.wordTotal: int = 0
+        self.charTotal: int = 0
+
+    def build(self) -> Iterator[None]:
+        while not self.isReady():
+            start = len(self.words)
+            words, chars = self._count(
+                self.document.linesRange(start, start + BUILD_LINES)
+            )
+
+            self.words.extend(words)
+            self.chars.extend(chars)
+            self.wordTotal += sum(words)
+            self.charTotal += sum(chars)
+
+            yield None
+
+    def isReady(self) -> bool:
+        return len(self.words) == self.document.lineCount()
+
+    def wordCount(self) -> int:
+        for _ in self.build():
+            pass
+
+        return self.wordTotal
+
+    def charCount(self) -> int:
+        for _ in self.build():
+            pass
+
+        return self.charTotal
+
+    @staticmethod
+    def _count(lines: Iterable[str]) -> tuple[array[int], array[int]]:
+        words = array("I")
+        chars = array("I")
+
+        for lineWords, lineChars in map(lineCounts, lines):
+            words.append(lineWords)
+            chars.append(lineChars)
+
+        return words, chars
+
+    def _truncate(self, row: int) -> None:
+        if row < len(self.words):
+            self.wordTotal -= sum(self.words[row:])
+            self.charTotal -= sum(self.chars[row:])
+            del self.words[row:]
+            del self.chars[row:]
+
+    def _replace(self, start: int, stop: int, newStop: int) -> None:
+        if stop > len(self.words):
+            self._truncate(start)
+            return
+
+        words, chars = self._count(self.document.linesRange(start, newStop))
+
+        self.wordTotal += sum(words) - sum(self.words[start:stop])
+        self.charTotal += sum(chars) - sum(self.chars[start:stop])
+        self.words[start:stop] = words
+        self.chars[start:stop] = chars
+
+    def insertText(self, row: int, col: int, text: str) -> None:
+        self._replace(row, row + 1, row + text.count("\n") + 1)
+
+    def deleteText(self, s_row: int, s_col: int, e_row: int, e_col: int) -> None:
+        self._replace(s_row, e_row + 1, s_row + 1)
+
+    def replaceLines(self, diffs: list[LineDiff]) -> None:
+        for row, col, removed, inserted in diffs:
+            if "\n" in removed or "\n" in inserted:
+                self._truncate(diffs[0][0])
+                return
+
+        for row, col, removed, inserted in diffs:
+            if row >= len(self.words):
+                break
+
+            self._replace(row, row + 1, row + 1)
+
+    def resetText(self, document: Document) -> None:
+        self.document = document
+        self._truncate(0)
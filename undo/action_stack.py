@@ -0,0 +1,135 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+from array import array
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from action.edit_action import EditAction
+
+COMPACT_THRESHOLD: int = 4096
+
+
+class ActionStack:
+    def __init__(self) -> None:
+        self.classes: list[type[EditAction] | None] = [None]
+        self.kinds: array[int] = array("B")
+        self.rows: array[int] = array("I")
+        self.cols: array[int] = array("I")
+        self.payloads: list[Any] = []
+        self.start: int = 0
+
+    def __len__(self) -> int:
+        return len(self.payloads) - self.start
+
+    def _kind(self, action: EditAction) -> int:
+        actionClass = type(action)
+
+        if actionClass not in self.classes:
+            self.classes.append(actionClass)
+
+        return self.classes.index(actionClass)
+
+    def _pack(self, action: EditAction) -> tuple[int, int, int, Any]:
+        packed = action.pack()
+        if packed is None:
+            return 0, 0, 0, action
+
+        return (self._kind(action), *packed)
+
+    def _unpack(self, index: int) -> EditAction:
+        kind, payload = self.kinds[index], self.payloads[index]
+        actionClass = self.classes[kind]
+        if actionClass is None:
+            return payload
+
+        return actionClass.unpack(self.rows[index], self.cols[index], payload)
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("action stack index out of range")
+
+        return self.start + index
+
+    def __getitem__(self, index: int) -> EditAction:
+        return self._unpack(self._index(index))
+
+    def __iter__(self) -> Iterator[EditAction]:
+        for index in range(self.start, len(self.payloads)):
+            yield self._unpack(index)
+
+    def __reversed__(self) -> Iterator[EditAction]:
+        for index in range(len(self.payloads) - 1, self.start - 1, -1):
+            yield self._unpack(index)
+
+    def top(self) -> EditAction:
+        action = self[-1]
+
+        self.kinds[-1] = 0
+        self.payloads[-1] = action
+
+        return action
+
+    def append(self, action: EditAction) -> None:
+        if len(self.payloads) > self.start and self.kinds[-1] == 0:
+            kind, row, col, payload = self._pack(self.payloads[-1])
+
+            self.kinds[-1] = kind
+            self.rows[-1] = row
+            self.cols[-1] = col
+            self.payloads[-1] = payload
+
+        self.kinds.append(0)
+        self.rows.append(0)
+        self.cols.append(0)
+        self.payloads.append(action)
+
+    def pop(self) -> EditAction:
+        if len(self.payloads) == self.start:
+            raise IndexError("pop from an empty action stack")
+
+        action = self._unpack(len(self.payloads) - 1)
+
+        self.kinds.pop()
+        self.rows.pop()
+        self.cols.pop()
+        self.payloads.pop()
+
+        return action
+
+    def popleft(self) -> EditAction:
+        if not len(self):
+            raise IndexError("pop from an empty action stack")
+
+        action = self._unpack(self.start)
+        self.payloads[self.start] = None
+        self.start += 1
+
+        if self.start >= COMPACT_THRESHOLD and self.start * 2 >= len(self.payloads):
+            self._compact()
+
+        return action
+
+    def _compact(self) -> None:
+        del self.kinds[: self.start]
+        del self.rows[: self.start]
+        del self.cols[: self.start]
+        del self.payloads[: self.start]
+        self.start = 0
+
+    def prepend(self, actions: Iterable[EditAction]) -> None:
+        remaining = list(self)
+        self.clear()
+
+        for action in actions:
+            self.append(action)
+        for action in remaining:
+            self.append(action)
+
+    def clear(self) -> None:
+        self.kinds = array("B")
+        self.rows = array("I")
+        self.cols = array("I")
+        self.payloads = []
+        self.start = 0
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+READ_CHUNK_SIZE: int = 1024 * 1024
+
+
+class UndoHistory:
+    def __init__(self, directory: str) -> None:
+        self.directory: str = directory
+
+    def _path(self, filePath: str) -> str:
+        key = hashlib.sha1(os.path.abspath(filePath).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.hist")
+
+    @staticmethod
+    def digestHasher() -> hashlib._Hash:
+        return hashlib.sha256()
+
+    @classmethod
+    def fileDigest(cls, filePath: str) -> str:
+        hasher = cls.digestHasher()
+
+        with open(filePath, "rb") as file:
+            while chunk := file.read(READ_CHUNK_SIZE):
+                hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def fileStamp(filePath: str) -> list[int]:
+        stat = os.stat(filePath)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def save(
+        self,
+        filePath: str,
+        digest: str,
+        undoRecords: Iterable[list[Any]],
+        redoRecords: Iterable[list[Any]],
+    ) -> None:
+        data = {
+            "path": os.path.abspath(filePath),
+            "digest": digest,
+            "stamp": self.fileStamp(filePath),
+            "undo": list(undoRecords),
+            "redo": list(redoRecords),
+        }
+        payload = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with open(fd, "wb") as file:
+                file.write(payload)
+            os.replace(temp_path, self._path(filePath))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def load(
+        self, filePath: str, digest: str | None = None
+    ) -> tuple[list[list[Any]], list[list[Any]]] | None:
+        try:
+            with open(self._path(filePath), "rb") as file:
+                data = json.loads(zlib.decompress(file.read()))
+
+            if data["path"] != os.path.abspath(filePath):
+                return None
+            if digest is None:
+                if data["stamp"] != self.fileStamp(filePath):
+                    return None
+            elif data["digest"] != digest:
+                return None
+
+            return data["undo"], data["redo"]
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
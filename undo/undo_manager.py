@@ -1,11 +1,20 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from tkinter import Event
+from typing import TYPE_CHECKING, Any
+from bisect import bisect_left, insort
+from contextlib import nullcontext
+from time import monotonic
+from undo.action_stack import ActionStack
 
 if TYPE_CHECKING:
+    from tkinter import Event
     from action.edit_action import EditAction
     from undo.undo_observer import UndoObserver
     from undo.redo_observer import RedoObserver
+    from text.text_editor_model import TextEditorModel
+    from document.document import Document
+    from location.location import Location
+    from contextlib import AbstractContextManager
+    from collections.abc import Callable, Reversible
 
 
 class UndoManager:
@@ -14,30 +23,65 @@ class UndoManager:
     def __init__(self) -> None:
         assert UndoManager._instance is None
 
-        self.undoStack: list[EditAction] = []
+        self.undoStack: ActionStack = ActionStack()
         self.redoStack: list[EditAction] = []
         self.undoObservers: list[UndoObserver] = []
         self.redoObservers: list[RedoObserver] = []
+        self.model: TextEditorModel | None = None
+        self.mergeActions: bool = True
+        self.mergeTimeout: float = 1.0
+        self.mergeBreakOnWords: bool = True
+        self.lastPushTime: float | None = None
+        self.maxHistoryBytes: int | None = 64 * 1024 * 1024
+        self.maxHistoryEntries: int | None = None
+        self.historyBytes: int = 0
+        self.historyLoader: (
+            Callable[[], tuple[list[EditAction], list[EditAction]] | None] | None
+        ) = None
+        self.historyBase: int = 0
+        self.checkpointInterval: int = 64
+        self.maxCheckpoints: int = 64
+        self.checkpoints: dict[int, tuple[Document, Location, int]] = {}
+        self.checkpointPositions: list[int] = []
+        self.checkpointBytes: int = 0
+        self.pendingCheckpoint: int | None = None
         UndoManager._instance = self
 
-    def undo(self, event: Event | None) -> None:
+    def setModel(self, model: TextEditorModel) -> None:
+        self.model = model
+
+    def _transaction(self) -> AbstractContextManager[None]:
+        return self.model.transaction() if self.model else nullcontext()
+
+    def undo(self, event: Event | None = None) -> None:
+        if not self.undoStack:
+            self.loadHistory()
+
         if not self.undoStack:
             return
 
+        self.breakMerge()
         action = self.undoStack.pop()
         self.redoStack.append(action)
-        action.executeUndo()
+
+        assert self.model is not None
+        with self._transaction():
+            action.executeUndo(self.model)
 
         self.notifyUndoObservers()
         self.notifyRedoObservers()
 
-    def redo(self, event: Event | None) -> None:
+    def redo(self, event: Event | None = None) -> None:
         if not self.redoStack:
             return
 
+        self.breakMerge()
         action = self.redoStack.pop()
         self.undoStack.append(action)
-        action.executeDo()
+
+        assert self.model is not None
+        with self._transaction():
+            action.executeDo(self.model)
 
         self.notifyUndoObservers()
         self.notifyRedoObservers()
@@ -46,12 +90,218 @@ class UndoManager:
         if not action:
             return
 
+        self.historyBytes -= sum(redone.size() for redone in self.redoStack)
         self.redoStack = []
-        self.undoStack.append(action)
+        self._dropCheckpoints(self.getHistoryPosition() + 1, None)
+
+        now = monotonic()
+        if not self._mergeIntoLast(action, now):
+            self.undoStack.append(action)
+            self.historyBytes += action.size()
+            if self.getHistoryPosition() % self.checkpointInterval == 0:
+                self.pendingCheckpoint = None
+                self._checkpoint()
+            elif self.pendingCheckpoint is not None:
+                self.pendingCheckpoint = self.getHistoryPosition()
+        elif self.getHistoryPosition() in self.checkpoints:
+            self.pendingCheckpoint = self.getHistoryPosition()
+            self._removeCheckpoint(self.pendingCheckpoint)
+            self.checkpointPositions.remove(self.pendingCheckpoint)
+        self.lastPushTime = now
+
+        self._evict()
 
         self.notifyUndoObservers()
         self.notifyRedoObservers()
 
+    def _mergeIntoLast(self, action: EditAction, now: float) -> bool:
+        if not self.mergeActions or not self.undoStack or self.lastPushTime is None:
+            return False
+
+        if now - self.lastPushTime > self.mergeTimeout:
+            return False
+
+        last = self.undoStack.top()
+        lastSize = last.size()
+        if not last.merge(action, self.mergeBreakOnWords):
+            return False
+
+        self.historyBytes += last.size() - lastSize
+        return True
+
+    def breakMerge(self) -> None:
+        self._flushCheckpoint()
+        self.lastPushTime = None
+
+    def _evict(self) -> None:
+        while (
+            self.checkpointPositions
+            and self.maxHistoryBytes is not None
+            and self.historyBytes + self.checkpointBytes > self.maxHistoryBytes
+        ):
+            self._removeCheckpoint(self.checkpointPositions.pop(0))
+
+        while len(self.undoStack) > 1 and (
+            (
+                self.maxHistoryEntries is not None
+                and len(self.undoStack) > self.maxHistoryEntries
+            )
+            or (
+                self.maxHistoryBytes is not None
+                and self.historyBytes > self.maxHistoryBytes
+            )
+        ):
+            self.historyBytes -= self.undoStack.popleft().size()
+            self.historyBase += 1
+
+        self._dropCheckpoints(None, self.historyBase)
+
+    def getHistoryPosition(self) -> int:
+        return self.historyBase + len(self.undoStack)
+
+    def getHistoryBounds(self) -> tuple[int, int]:
+        return self.historyBase, self.getHistoryPosition() + len(self.redoStack)
+
+    def _checkpoint(self) -> None:
+        if self.model is None:
+            return
+
+        position = self.getHistoryPosition()
+        if position in self.checkpoints:
+            self._removeCheckpoint(position)
+        else:
+            insort(self.checkpointPositions, position)
+
+        snapshot = self.model.snapshot()
+        size = snapshot.snapshotSize()
+        self.checkpoints[position] = (snapshot, self.model.getCursorLocation(), size)
+        self.checkpointBytes += size
+
+        if len(self.checkpoints) > self.maxCheckpoints:
+            self.checkpointInterval *= 2
+            for old in self.checkpointPositions:
+                if old % self.checkpointInterval:
+                    self._removeCheckpoint(old)
+            self.checkpointPositions = sorted(self.checkpoints)
+
+    def _flushCheckpoint(self) -> None:
+        position, self.pendingCheckpoint = self.pendingCheckpoint, None
+
+        if position is not None and position == self.getHistoryPosition():
+            self._checkpoint()
+
+    def _removeCheckpoint(self, position: int) -> None:
+        self.checkpointBytes -= self.checkpoints.pop(position)[2]
+
+    def _dropCheckpoints(self, start: int | None, end: int | None) -> None:
+        for position in self.checkpointPositions:
+            if (start is None or position >= start) and (end is None or position < end):
+                self._removeCheckpoint(position)
+        self.checkpointPositions = sorted(self.checkpoints)
+
+    def _nearestCheckpoint(self, position: int) -> int | None:
+        index = bisect_left(self.checkpointPositions, position)
+        candidates = self.checkpointPositions[max(index - 1, 0) : index + 1]
+        return min(candidates, key=lambda c: abs(c - position), default=None)
+
+    def revertTo(self, position: int) -> None:
+        if self.historyLoader is not None and position < self.historyBase:
+            self.loadHistory()
+
+        start, end = self.getHistoryBounds()
+        current = self.getHistoryPosition()
+        if not start <= position <= end or position == current:
+            return
+
+        assert self.model is not None
+        self.breakMerge()
+        checkpoint = self._nearestCheckpoint(position)
+
+        with self._transaction():
+            if checkpoint is not None and abs(position - checkpoint) < abs(
+                position - current
+            ):
+                document, cursorLocation, _ = self.checkpoints[checkpoint]
+                self.model.restoreDocument(document)
+                self.model.setCursorLocation(cursorLocation)
+                self._moveHistory(checkpoint, None)
+
+            self._moveHistory(position, self.model)
+
+        self.notifyUndoObservers()
+        self.notifyRedoObservers()
+
+    def _moveHistory(self, position: int, model: TextEditorModel | None) -> None:
+        steps = self.getHistoryPosition() - position
+
+        for _ in range(steps):
+            action = self.undoStack.pop()
+            self.redoStack.append(action)
+            if model:
+                action.executeUndo(model)
+
+        for _ in range(-steps):
+            action = self.redoStack.pop()
+            self.undoStack.append(action)
+            if model:
+                action.executeDo(model)
+
+    def clear(self) -> None:
+        self.undoStack.clear()
+        self.redoStack = []
+        self.historyBytes = 0
+        self.historyLoader = None
+        self.historyBase = 0
+        self.checkpoints = {}
+        self.checkpointPositions = []
+        self.checkpointBytes = 0
+        self.pendingCheckpoint = None
+        self.breakMerge()
+
+        self.notifyUndoObservers()
+        self.notifyRedoObservers()
+
+    def setHistoryLoader(
+        self,
+        historyLoader: Callable[[], tuple[list[EditAction], list[EditAction]] | None],
+    ) -> None:
+        self.historyLoader = historyLoader
+        self.notifyUndoObservers()
+
+    def loadHistory(self) -> None:
+        historyLoader, self.historyLoader = self.historyLoader, None
+        history = historyLoader() if historyLoader else None
+
+        if history:
+            undoActions, redoActions = history
+
+            if not self.undoStack and not self.redoStack:
+                self.redoStack = redoActions
+                self.historyBytes += sum(action.size() for action in redoActions)
+
+            self.undoStack.prepend(undoActions)
+            self.historyBase -= len(undoActions)
+            self.historyBytes += sum(action.size() for action in undoActions)
+            self._evict()
+
+        self.notifyUndoObservers()
+        self.notifyRedoObservers()
+
+    def toRecords(self) -> tuple[list[list[Any]], list[list[Any]]]:
+        return self._records(self.undoStack), self._records(self.redoStack)
+
+    def _records(self, actions: Reversible[EditAction]) -> list[list[Any]]:
+        records = []
+
+        for action in reversed(actions):
+            record = action.toRecord()
+            if record is None:
+                break
+            records.append(record)
+
+        records.reverse()
+        return records
+
     @staticmethod
     def getInstance() -> UndoManager:
         if UndoManager._instance is None:
@@ -68,7 +318,9 @@ class UndoManager:
 
     def notifyUndoObservers(self) -> None:
         for undoObserver in self.undoObservers:
-            undoObserver.updateUndoStack(len(self.undoStack) == 0)
+            undoObserver.updateUndoStack(
+                len(self.undoStack) == 0 and self.historyLoader is None
+            )
 
     def addRedoObserver(self, redoObserver: RedoObserver) -> None:
         self.redoObservers.append(redoObserver)